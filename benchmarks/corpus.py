@@ -0,0 +1,62 @@
+"""Generator of synthetic type-test suites for benchmarking typest"""
+import random
+from pathlib import Path
+
+
+_LEAVES = ["int", "str", "bytes", "float", "bool"]
+
+
+def _type(rng: random.Random, depth: int) -> str:
+    if depth == 0:
+        return rng.choice(_LEAVES)
+
+    inner = _type(rng, depth - 1)
+    match rng.randrange(5):
+        case 0:
+            return f"List[{inner}]"
+        case 1:
+            return f"Dict[str, {inner}]"
+        case 2:
+            return f"Tuple[{inner}, {_type(rng, depth - 1)}]"
+        case 3:
+            return f"Union[{inner}, {_type(rng, depth - 1)}]"
+        case _:
+            return f"Optional[{inner}]"
+
+
+def generate_file(rng: random.Random, directives: int, depth: int) -> str:
+    """Source of a test file with the given number of expectations, alternating
+    between expect-type and expect-error. Types of the expect-type directives
+    are nested up to the given depth."""
+    lines = [
+        "from typing import Dict, List, Optional, Tuple, Union",
+        "from typing_extensions import reveal_type",
+        "",
+    ]
+    for index in range(directives):
+        if index % 2 == 0:
+            typ = _type(rng, rng.randint(0, depth))
+            lines.append(f"v{index}: {typ}")
+            lines.append(f"reveal_type(v{index})  # expect-type: {typ}")
+        else:
+            lines.append(f'e{index}: int = "text"  # expect-error')
+    return "\n".join(lines) + "\n"
+
+
+def generate(
+    directory: Path,
+    files: int,
+    directives: int,
+    depth: int,
+    seed: int = 0,
+) -> list[Path]:
+    """Write a synthetic suite of test files into the directory. The same
+    parameters always generate the same suite."""
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(files):
+        path = directory / f"case_{index:05}.py"
+        path.write_text(generate_file(rng, directives, depth))
+        paths.append(path)
+    return paths
@@ -0,0 +1,194 @@
+"""Benchmark of typest's own overhead, stage by stage, on a synthetic suite.
+
+    python -m benchmarks.run --files 100 --directives 30 --output results.json
+    python -m benchmarks.run --compare results.json
+"""
+import argparse
+import json
+import platform
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from subprocess import DEVNULL, PIPE, run
+from typing import Any, Callable, Type
+
+from benchmarks.corpus import generate
+from typest.typecheckers import select, TypeChecker
+from typest.utils import fake_type, scanner
+
+
+def _timed(function: Callable[[], Any]) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def _commit() -> str | None:
+    process = run(["git", "rev-parse", "HEAD"], stdout=PIPE, stderr=DEVNULL)
+    return process.stdout.decode("utf-8").strip() or None
+
+
+def _clear_parse_caches() -> None:
+    """Forget parsed types, including the interned type nodes"""
+    fake_type.parse.cache_clear()
+    for node_type in (
+        fake_type.FakeBuiltin,
+        fake_type.FakeGeneric,
+        fake_type.FakeUnion,
+    ):
+        node_type._interned.clear()
+
+
+def _bench_startup(repeat: int = 10) -> dict[str, float]:
+    """Fastest of several starts of a fresh interpreter, importing the CLI and
+    printing its help"""
+
+    def fastest(command: list[str]) -> float:
+        return min(
+            _timed(lambda: run(command, stdout=DEVNULL, check=True))[0]
+            for _ in range(repeat)
+        )
+
+    baseline = fastest([sys.executable, "-c", "pass"])
+    return {
+        "import": fastest([sys.executable, "-c", "import typest.__main__"])
+        - baseline,
+        "help": fastest([sys.executable, "-m", "typest", "--help"]) - baseline,
+    }
+
+
+def _bench_scanning(paths: list[Path]) -> float:
+    scanner._scan.cache_clear()
+    _clear_parse_caches()
+    duration, _ = _timed(lambda: [scanner.scan(path) for path in paths])
+    return duration
+
+
+def _bench_parse(paths: list[Path]) -> dict[str, float]:
+    texts = [
+        match.group(1)
+        for path in paths
+        for match in re.finditer(r"# expect-type:(.*)", path.read_text())
+    ]
+    _clear_parse_caches()
+    cold, _ = _timed(lambda: [fake_type.parse(text) for text in texts])
+    warm, _ = _timed(lambda: [fake_type.parse(text) for text in texts])
+    return {"cold": cold, "warm": warm}
+
+
+def _bench_typechecker(
+    typechecker: Type[TypeChecker], paths: list[Path]
+) -> dict[str, float]:
+    invocation, lines = _timed(lambda: list(typechecker._output(paths)))
+
+    _clear_parse_caches()
+    parsing, outcomes = _timed(
+        lambda: dict(typechecker._route(paths, typechecker._diagnostics(lines)))
+    )
+
+    checkers = [typechecker(path) for path in paths]
+    for checker in checkers:
+        checker._expected_outcomes()
+        checker._actual = outcomes[checker.path]
+    matching, _ = _timed(lambda: [checker.run() for checker in checkers])
+
+    return {
+        "invocation": invocation,
+        "parsing": parsing,
+        "matching": matching,
+        "output_lines": len(lines),
+    }
+
+
+def benchmark(
+    typecheckers: list[Type[TypeChecker]],
+    files: int,
+    directives: int,
+    depth: int,
+    seed: int,
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="typest-bench-") as directory:
+        paths = generate(Path(directory), files, directives, depth, seed)
+        return {
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "parameters": {
+                "files": files,
+                "directives": directives,
+                "depth": depth,
+                "seed": seed,
+            },
+            "stages": {
+                "startup": _bench_startup(),
+                "scanning": _bench_scanning(paths),
+                "parse": _bench_parse(paths),
+                **{
+                    typechecker.name: _bench_typechecker(typechecker, paths)
+                    for typechecker in typecheckers
+                },
+            },
+        }
+
+
+def _flatten(stages: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    flat: dict[str, float] = {}
+    for name, value in stages.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{name}."))
+        else:
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+
+def compare(baseline: dict[str, Any], results: dict[str, Any]) -> str:
+    """Table of the stage timings of both runs, and their ratio"""
+    before = _flatten(baseline["stages"])
+    after = _flatten(results["stages"])
+    rows = [f"{'stage':<30}{'baseline':>12}{'current':>12}{'ratio':>8}"]
+    for stage, value in after.items():
+        if stage not in before:
+            continue
+        ratio = value / before[stage] if before[stage] else float("nan")
+        rows.append(
+            f"{stage:<30}{before[stage]:>12.4f}{value:>12.4f}{ratio:>8.2f}"
+        )
+    return "\n".join(rows)
+
+
+parser = argparse.ArgumentParser(
+    prog="benchmarks.run",
+    description="Benchmark typest on a synthetic suite",
+)
+parser.add_argument("--files", type=int, default=50)
+parser.add_argument("--directives", type=int, default=30)
+parser.add_argument("--depth", type=int, default=3)
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument(
+    "--typecheckers",
+    default="mypy",
+    help="comma separated names of the typecheckers to invoke",
+)
+parser.add_argument("--output", type=Path, help="write results as JSON")
+parser.add_argument(
+    "--compare", type=Path, help="JSON results of a previous run to compare to"
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    names = args.typecheckers.split(",") if args.typecheckers else []
+    results = benchmark(
+        select(names),
+        args.files,
+        args.directives,
+        args.depth,
+        args.seed,
+    )
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.compare is not None:
+        print(compare(json.loads(args.compare.read_text()), results))
+    else:
+        print(json.dumps(results, indent=2))
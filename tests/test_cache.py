@@ -0,0 +1,79 @@
+import tempfile
+from pathlib import Path
+from subprocess import CompletedProcess
+from unittest import TestCase
+from unittest.mock import patch
+
+from typest.cache import Cache
+from typest.outcomes import Flaw
+from typest.typecheckers.mypy import Mypy
+
+
+class TestCache(TestCase):
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.directory = Path(temporary.name)
+        self.cache = Cache(self.directory / "cache")
+        self.testfile = self.directory / "case.py"
+        self.testfile.write_text("x: int = 1\n")
+
+    def test_roundtrip(self):
+        key = self.cache.key(Mypy, self.testfile)
+        self.assertIsNone(self.cache.get(key))
+
+        self.cache.set(key, {1: [Flaw(1)]})
+        self.assertEqual(self.cache.get(key), {1: [Flaw(1)]})
+
+    def test_key_depends_on_content(self):
+        key = self.cache.key(Mypy, self.testfile)
+        self.testfile.write_text("x: int = 2\n")
+        self.assertNotEqual(self.cache.key(Mypy, self.testfile), key)
+
+    def test_key_depends_on_imported_modules(self):
+        module = self.directory / "module.py"
+        module.write_text("y = 1\n")
+        self.testfile.write_text("from module import y\n")
+        key = self.cache.key(Mypy, self.testfile)
+        module.write_text("y = '1'\n")
+        self.assertNotEqual(self.cache.key(Mypy, self.testfile), key)
+
+    def test_key_depends_on_installed_version(self):
+        class Installed(Mypy):
+            version = "1.0"
+
+            @classmethod
+            def installed_version(cls):
+                return cls.version
+
+        key = self.cache.key(Installed, self.testfile)
+        Installed.version = "2.0"
+        self.assertNotEqual(self.cache.key(Installed, self.testfile), key)
+
+    def test_version_looked_up_once_per_executable(self):
+        output = CompletedProcess([], 0, stdout=b"mypy 1.0")
+        with patch("typest.cache.run", return_value=output) as run:
+            self.cache.key(Mypy, self.testfile)
+            # Kept in the cache directory across sessions
+            Cache(self.directory / "cache").key(Mypy, self.testfile)
+        self.assertEqual(run.call_count, 1)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.max_size = 0
+        self.cache.set("first", {})
+        self.cache.evict()
+        self.assertIsNone(self.cache.get("first"))
+
+    def test_key_depends_on_imported_stubs(self):
+        (self.directory / "module.py").write_text("def f(): return 1\n")
+        stub = self.directory / "module.pyi"
+        stub.write_text("def f() -> int: ...\n")
+        self.testfile.write_text("from module import f\n")
+        key = self.cache.key(Mypy, self.testfile)
+        stub.write_text("def f() -> str: ...\n")
+        self.assertNotEqual(self.cache.key(Mypy, self.testfile), key)
+
+    def test_key_depends_on_path(self):
+        other = self.directory / "other.py"
+        other.write_text(self.testfile.read_text())
+        self.assertNotEqual(self.cache.key(Mypy, other), self.cache.key(Mypy, self.testfile))
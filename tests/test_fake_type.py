@@ -1,3 +1,5 @@
+import gc
+import pickle
 from unittest import TestCase
 
 from typest.utils.fake_type import (
@@ -85,3 +87,33 @@ class TestEquality(TestCase):
         once = FakeUnion("SomeType")
         twice = FakeUnion("SomeType", "SomeType")
         self.assertEqual(once, twice)
+
+
+class TestHash(TestCase):
+    def test_union_with_several_members(self):
+        self.assertEqual(hash(FakeUnion("this", "that")), hash(FakeUnion("that", "this")))
+
+    def test_generic(self):
+        generic = parse("SomeGeneric[Union[int, str]]")
+        self.assertIn(generic, {parse("SomeGeneric[Union[str, int]]")})
+
+    def test_none_equals_none_type(self):
+        self.assertEqual(hash(FakeBuiltin("None")), hash(FakeBuiltin("NoneType")))
+
+
+class TestInterning(TestCase):
+    def test_equal_arguments_give_identical_nodes(self):
+        self.assertIs(FakeGeneric("SomeGeneric", FakeBuiltin("int")), parse("SomeGeneric[int]"))
+
+    def test_nodes_are_immutable(self):
+        with self.assertRaises(AttributeError):
+            FakeBuiltin("int")._args = ("str",)
+
+    def test_pickling_preserves_identity(self):
+        generic = parse("SomeGeneric[Optional[int]]")
+        self.assertIs(pickle.loads(pickle.dumps(generic)), generic)
+
+    def test_unused_nodes_are_not_kept(self):
+        FakeGeneric("UnusedGeneric", FakeBuiltin("int"))
+        gc.collect()
+        self.assertNotIn(("UnusedGeneric", FakeBuiltin("int")), FakeGeneric._interned)
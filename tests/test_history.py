@@ -0,0 +1,57 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from typest.error import RecordedError
+from typest.history import History
+from typest.result import Result
+
+
+class TestHistory(TestCase):
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.directory = Path(temporary.name).resolve()
+        self.history = History(self.directory / "history.sqlite")
+        self.passing = self.directory / "passing.py"
+        self.failing = self.directory / "failing.py"
+
+    def tearDown(self):
+        self.history.close()
+
+    def test_failed(self):
+        self.history.record(
+            [
+                Result(self.passing, "mypy", []),
+                Result(self.failing, "mypy", []),
+                Result(self.failing, "pyright", [RecordedError(self.failing, 1, "")]),
+            ]
+        )
+        files = [self.passing, self.failing]
+        self.assertEqual(self.history.failed(files, ["mypy", "pyright"]), [self.failing])
+        # Failures of typecheckers which are not selected do not count
+        self.assertEqual(self.history.failed(files, ["mypy"]), [])
+
+        self.history.record([Result(self.failing, "pyright", [])])
+        self.assertEqual(self.history.failed(files, ["mypy", "pyright"]), [])
+
+    def test_cached_results_keep_duration(self):
+        self.history.record([Result(self.passing, "mypy", [], duration=2.0)])
+        self.history.record([Result(self.passing, "mypy", [], duration=None)])
+        self.assertEqual(self.history.durations(), {(self.passing.as_posix(), "mypy"): 2.0})
+
+    def test_longest_first(self):
+        self.history.record(
+            [
+                Result(self.passing, "mypy", [], duration=1.0),
+                Result(self.failing, "mypy", [], duration=3.0),
+            ]
+        )
+        runs = [(self.passing, "mypy"), (self.failing, "mypy"), (self.passing, "pyright")]
+        self.assertEqual(self.history.longest_first(runs), [2, 1, 0])
+
+    def test_persisted(self):
+        self.history.record([Result(self.failing, "mypy", [RecordedError(self.failing, 1, "")])])
+        self.history.close()
+        self.history = History(self.directory / "history.sqlite")
+        self.assertEqual(self.history.failed([self.failing], ["mypy"]), [self.failing])
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from typest.import_index import changed_since, ImportIndex
+
+
+class TestImportIndex(TestCase):
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.directory = Path(temporary.name).resolve()
+        self.library = self.directory / "library.py"
+        self.library.write_text("from helpers import x\n")
+        self.helpers = self.directory / "helpers.py"
+        self.helpers.write_text("x = 1\n")
+        self.importing = self.directory / "importing_case.py"
+        self.importing.write_text("from library import x\n")
+        self.other = self.directory / "other_case.py"
+        self.other.write_text("y = 1\n")
+        self.file = self.directory / "index" / "imports.json"
+
+    def test_transitive_imports(self):
+        index = ImportIndex(self.file)
+        self.assertEqual(index.imports(self.importing), {self.library, self.helpers})
+        self.assertEqual(index.imports(self.other), set())
+
+    def test_affected(self):
+        index = ImportIndex(self.file)
+        testfiles = [self.importing, self.other]
+        self.assertEqual(index.affected(testfiles, {self.helpers}), [self.importing])
+        self.assertEqual(index.affected(testfiles, {self.other}), [self.other])
+        self.assertEqual(index.affected(testfiles, set()), [])
+
+    def test_persisted(self):
+        index = ImportIndex(self.file)
+        index.imports(self.importing)
+        index.save()
+
+        # Files of unchanged mtime and size are not parsed again
+        stat = self.library.stat()
+        self.library.write_text("#".ljust(stat.st_size - 1) + "\n")
+        os.utime(self.library, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(
+            ImportIndex(self.file).imports(self.importing), {self.library, self.helpers}
+        )
+
+    def test_updated_on_change(self):
+        index = ImportIndex(self.file)
+        index.imports(self.importing)
+        index.save()
+
+        self.library.write_text("z = 2\n")
+        stat = self.library.stat()
+        os.utime(self.library, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(ImportIndex(self.file).imports(self.importing), {self.library})
+
+
+class TestChangedSince(TestCase):
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.directory = Path(temporary.name).resolve()
+        self.cwd = Path.cwd()
+        os.chdir(self.directory)
+
+        def git(*args):
+            subprocess.run(["git", *args], check=True, stdout=subprocess.DEVNULL)
+
+        git("init", "-q")
+        (self.directory / "committed.py").write_text("a = 1\n")
+        (self.directory / "modified.py").write_text("b = 1\n")
+        git("add", ".")
+        git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-qm", "base")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+
+    def test_modified_and_untracked(self):
+        (self.directory / "modified.py").write_text("b = 2\n")
+        (self.directory / "new.py").write_text("c = 1\n")
+        self.assertEqual(
+            changed_since("HEAD"),
+            {self.directory / "modified.py", self.directory / "new.py"},
+        )
+
+    def test_unknown_ref(self):
+        with self.assertRaises(ValueError):
+            changed_since("no-such-ref")
@@ -0,0 +1,67 @@
+import io
+import tempfile
+import time
+from pathlib import Path
+from threading import Event, Lock
+from unittest import TestCase
+
+from typest.__main__ import _run_files
+from typest.history import History
+from typest.reporters import TerminalReporter
+from typest.result import Result
+from typest.typecheckers.mypy import Mypy
+
+PATHS = [Path("tests/cases/empty_case.py"), Path("tests/cases/passing_case.py")]
+
+
+class TestRunFiles(TestCase):
+    def test_batch_results_reported_before_typechecker_finishes(self):
+        reported = Event()
+
+        class StreamingMypy(Mypy):
+            @classmethod
+            def iter_batch(cls, paths):
+                yield cls(paths[0])
+                # The typechecker finishes only once the first file is reported
+                if not reported.wait(timeout=10):
+                    raise AssertionError("first file was not reported")
+                yield from Mypy.iter_batch.__func__(cls, paths[1:])
+
+        class Reporter(TerminalReporter):
+            def report(self, result):
+                super().report(result)
+                reported.set()
+
+        results = _run_files([StreamingMypy], PATHS, True, 1, Reporter(io.StringIO()))
+        self.assertEqual([result.path for result in results], PATHS)
+        self.assertTrue(all(result.flawless for result in results))
+
+    def test_failed_files_started_first_then_longest_first(self):
+        paths = [*PATHS, Path("tests/cases/failing_case.py")]
+        started = []
+        lock = Lock()
+
+        class RecordingMypy(Mypy):
+            name = "recording"
+
+            def run(self):
+                with lock:
+                    started.append(self.path)
+                time.sleep(0.1)
+                return []
+
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        history = History(Path(temporary.name) / "history.sqlite")
+        history.record(
+            [
+                Result(path, "recording", [], duration=duration)
+                for path, duration in zip(paths, [5.0, 10.0, 1.0])
+            ]
+        )
+        _run_files(
+            [RecordingMypy], paths, False, 2, TerminalReporter(io.StringIO()), history, paths[2:]
+        )
+        history.close()
+        self.assertEqual(set(started[:2]), {paths[2], paths[1]})
+        self.assertEqual(started[2], paths[0])
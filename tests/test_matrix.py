@@ -0,0 +1,64 @@
+from pathlib import Path
+from unittest import TestCase
+
+from typest.error import RecordedError
+from typest.matrix import differences, parse_cell
+from typest.result import Result
+from typest.typecheckers import Mypy, Pyright
+
+
+class TestParseCell(TestCase):
+    def test_plain_typechecker(self):
+        self.assertIs(parse_cell("mypy"), Mypy)
+
+    def test_settings(self):
+        cell = parse_cell("mypy:python-version=3.8,config-file=strict.ini")
+        self.assertTrue(issubclass(cell, Mypy))
+        self.assertEqual(cell.name, "mypy[python-version=3.8,config-file=strict.ini]")
+        command = cell.batch_command([Path("case.py")])
+        self.assertIn("--python-version", command)
+        self.assertIn("strict.ini", cell.config_files)
+        self.assertEqual(command[-1], "case.py")
+
+    def test_executable(self):
+        cell = parse_cell("pyright:executable=/opt/pyright/bin/pyright")
+        self.assertTrue(issubclass(cell, Pyright))
+        self.assertEqual(cell.batch_command([])[0], "/opt/pyright/bin/pyright")
+        self.assertEqual(cell.version_command()[0], "/opt/pyright/bin/pyright")
+        self.assertEqual(Pyright.batch_command([])[0], "pyright")
+
+    def test_unsupported_setting(self):
+        with self.assertRaises(ValueError):
+            parse_cell("dmypy:python-version=3.8")
+        with self.assertRaises(ValueError):
+            parse_cell("mypy-api:executable=mypy")
+        with self.assertRaises(ValueError):
+            parse_cell("mypy:strict")
+
+    def test_unknown_typechecker(self):
+        with self.assertRaises(ValueError):
+            parse_cell("pytype")
+
+
+class TestDifferences(TestCase):
+    def test_differing_expectation(self):
+        path = Path("case.py")
+        results = [
+            Result(path, "mypy[python-version=3.8]", [RecordedError(path, 3, "")]),
+            Result(path, "mypy[python-version=3.12]", []),
+            Result(path, "pyright", [RecordedError(path, 3, "")]),
+        ]
+        self.assertEqual(
+            differences(results),
+            "Differences between matrix cells\n"
+            "case.py:3 passes with mypy[python-version=3.12]; "
+            "fails with mypy[python-version=3.8], pyright\n",
+        )
+
+    def test_no_differences(self):
+        path = Path("case.py")
+        results = [
+            Result(path, "mypy", [RecordedError(path, 3, "")]),
+            Result(path, "pyright", [RecordedError(path, 3, "")]),
+        ]
+        self.assertEqual(differences(results), "No differences between matrix cells\n")
@@ -0,0 +1,66 @@
+import sys
+import time
+from unittest import TestCase, skipUnless
+
+from typest.utils.process import Aborted, resource, supervised
+
+PYTHON = [sys.executable, "-c"]
+
+
+class TestSupervised(TestCase):
+    def test_output(self):
+        with supervised([*PYTHON, "print('a'); print('b')"]) as process:
+            self.assertEqual(list(process.stdout), [b"a\n", b"b\n"])
+        self.assertEqual(process.returncode, 0)
+
+    def test_failing_process_is_not_aborted(self):
+        with supervised([*PYTHON, "import sys; sys.exit(1)"]) as process:
+            list(process.stdout)
+        self.assertEqual(process.returncode, 1)
+
+    def test_failing_process_with_warnings_is_not_aborted(self):
+        code = "import sys; sys.stderr.write('warning: unknown option'); sys.exit(1)"
+        with supervised([*PYTHON, code], memory_limit=2**32) as process:
+            list(process.stdout)
+        self.assertEqual(process.returncode, 1)
+
+    def test_timeout(self):
+        start = time.perf_counter()
+        with self.assertRaisesRegex(Aborted, "timed out after 0.2s"):
+            with supervised([*PYTHON, "import time; time.sleep(30)"], timeout=0.2) as process:
+                list(process.stdout)
+        self.assertLess(time.perf_counter() - start, 10)
+
+    def test_timeout_kills_process_group(self):
+        # The child of the process keeps its stdout open, unless it is killed
+        code = "import subprocess, sys; subprocess.run(['sleep', '30'])"
+        start = time.perf_counter()
+        with self.assertRaises(Aborted):
+            with supervised([*PYTHON, code], timeout=0.2) as process:
+                list(process.stdout)
+        self.assertLess(time.perf_counter() - start, 10)
+
+    def test_leaving_early_kills_process(self):
+        with self.assertRaises(KeyboardInterrupt):
+            with supervised([*PYTHON, "import time; time.sleep(30)"]) as process:
+                raise KeyboardInterrupt()
+        self.assertLess(process.returncode, 0)
+
+    @skipUnless(resource is not None, "needs resource limits")
+    def test_cpu_limit(self):
+        with self.assertRaisesRegex(Aborted, "CPU time limit"):
+            with supervised([*PYTHON, "while True: pass"], cpu_limit=1) as process:
+                list(process.stdout)
+
+    @skipUnless(resource is not None, "needs resource limits")
+    def test_memory_limit(self):
+        code = "x = bytearray(2**30)"
+        with self.assertRaisesRegex(Aborted, "memory limit"):
+            with supervised([*PYTHON, code], memory_limit=2**29) as process:
+                list(process.stdout)
+
+    @skipUnless(resource is not None, "needs resource limits")
+    def test_limits_apply_from_start(self):
+        code = "import resource; print(resource.getrlimit(resource.RLIMIT_CPU))"
+        with supervised([*PYTHON, code], cpu_limit=5) as process:
+            self.assertEqual(list(process.stdout), [b"(5, 6)\n"])
@@ -0,0 +1,76 @@
+import importlib.util
+import re
+import sys
+import tempfile
+from pathlib import Path
+from subprocess import PIPE, run
+from unittest import skipUnless, TestCase
+
+
+def _pytest(*args: str):
+    # The plugin's entry point is disabled, so that it is registered once,
+    # whether typest is installed or not
+    return run(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-p",
+            "no:typest",
+            "-p",
+            "typest.pytest_plugin",
+            "--typest-no-cache",
+            *args,
+        ],
+        stdout=PIPE,
+    )
+
+
+class TestPlugin(TestCase):
+    def test_passing_case(self):
+        process = _pytest("--typest", "-q", "tests/cases/passing_case.py")
+        self.assertEqual(process.returncode, 0)
+        self.assertIn(b"2 passed", process.stdout)
+
+    def test_failing_case(self):
+        process = _pytest(
+            "--typest", "-q", "tests/cases/failing_case.py", "--typest-typecheckers", "mypy"
+        )
+        self.assertEqual(process.returncode, 1)
+        self.assertIn(b"failing_case.py::mypy", process.stdout)
+        self.assertIn(b"=== LINE 7 ===", process.stdout)
+        self.assertNotIn(b"\x1b[", process.stdout)
+
+    def test_collects_nothing_unless_enabled(self):
+        process = _pytest("-q", "tests/cases")
+        self.assertIn(b"no tests ran", process.stdout)
+
+    @skipUnless(importlib.util.find_spec("xdist"), "pytest-xdist is not installed")
+    def test_batches_run_on_single_workers(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        directory = Path(temporary.name)
+        for index in range(8):
+            (directory / f"case_{index}.py").write_text(
+                "x: int = 1\nreveal_type(x)  # expect-type: int\n"
+            )
+        process = _pytest(
+            "--typest",
+            "--typest-typecheckers",
+            "mypy",
+            "--typest-batch-size",
+            "4",
+            "-n",
+            "3",
+            "--dist",
+            "loadgroup",
+            "-v",
+            str(directory),
+        )
+        self.assertEqual(process.returncode, 0)
+        workers: dict[str, set[str]] = {}
+        for worker, batch in re.findall(rb"\[(gw\d+)\].*PASSED .*::mypy@(\S+)", process.stdout):
+            workers.setdefault(batch.decode(), set()).add(worker.decode())
+        self.assertEqual(len(workers), 2)
+        for batch_workers in workers.values():
+            self.assertEqual(len(batch_workers), 1)
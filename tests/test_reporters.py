@@ -0,0 +1,71 @@
+import io
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from unittest import TestCase
+
+from typest.error import RecordedError
+from typest.reporters import JsonLinesReporter, JUnitReporter, TerminalReporter
+from typest.result import Result
+
+PASSING = Result(Path("passing.py"), "mypy", [], ".", duration=0.5)
+FAILING = Result(
+    Path("failing.py"),
+    "pyright",
+    [RecordedError(Path("failing.py"), 3, "=== LINE 3 ===\n")],
+    ".F",
+    duration=1.0,
+)
+SKIPPED = Result(Path("empty.py"), "mypy", [], skipped="no tests found")
+ABORTED = Result(Path("slow.py"), "mypy", [], aborted="timed out after 1s")
+
+
+def _report(reporter_class, results: list[Result], quiet: bool = False) -> str:
+    stream = io.StringIO()
+    reporter = reporter_class(stream, quiet)
+    for result in results:
+        reporter.report(result)
+    reporter.close()
+    return stream.getvalue()
+
+
+class TestTerminalReporter(TestCase):
+    def test_failure(self):
+        out = _report(TerminalReporter, [FAILING])
+        self.assertTrue(out.startswith("Running tests against pyright\n"))
+        self.assertIn("=== LINE 3 ===\n", out)
+
+    def test_quiet_only_failures(self):
+        out = _report(TerminalReporter, [PASSING, SKIPPED, FAILING], quiet=True)
+        self.assertEqual(out.count("Running tests against"), 1)
+        self.assertNotIn("passing.py", out)
+
+    def test_aborted(self):
+        out = _report(TerminalReporter, [ABORTED], quiet=True)
+        self.assertIn("aborted: timed out after 1s", out)
+
+
+class TestJsonLinesReporter(TestCase):
+    def test_one_line_per_result(self):
+        lines = _report(JsonLinesReporter, [PASSING, FAILING]).splitlines()
+        self.assertEqual([json.loads(line)["path"] for line in lines], ["passing.py", "failing.py"])
+        self.assertEqual(json.loads(lines[1])["errors"][0]["linenumber"], 3)
+        self.assertNotIn("\\u001b", lines[1])
+
+
+class TestJUnitReporter(TestCase):
+    def test_document(self):
+        suite = ET.fromstring(_report(JUnitReporter, [PASSING, FAILING, SKIPPED]))
+        self.assertEqual(suite.get("tests"), "3")
+        self.assertEqual(suite.get("failures"), "1")
+        self.assertEqual(suite.get("skipped"), "1")
+        cases = suite.findall("testcase")
+        self.assertEqual([case.get("classname") for case in cases], ["mypy", "pyright", "mypy"])
+        self.assertEqual(cases[1].find("failure").text, "=== LINE 3 ===\n")
+        self.assertIsNotNone(cases[2].find("skipped"))
+
+    def test_aborted_as_error(self):
+        suite = ET.fromstring(_report(JUnitReporter, [ABORTED]))
+        self.assertEqual(suite.get("errors"), "1")
+        self.assertEqual(suite.get("failures"), "0")
+        self.assertEqual(suite.find("testcase/error").get("message"), "timed out after 1s")
@@ -0,0 +1,49 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from typest.outcomes import Flaw, RevealedType
+from typest.utils.fake_type import FakeBuiltin, parse
+from typest.utils.scanner import scan, UnsupportedFile
+
+
+class TestScan(TestCase):
+    def _write(self, text: str) -> Path:
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        path = Path(temporary.name) / "case.py"
+        path.write_text(text)
+        return path
+
+    def test_passing_case(self):
+        expected = scan(Path("tests/cases/passing_case.py"))
+        self.assertEqual(
+            expected,
+            [
+                RevealedType(11, parse("int | str")),
+                RevealedType(13, parse("int | str")),
+                Flaw(15),
+            ],
+        )
+
+    def test_empty_case(self):
+        self.assertEqual(scan(Path("tests/cases/empty_case.py")), [])
+
+    def test_ignores_directives_in_strings(self):
+        path = self._write('text = "# expect-error"\nreveal_type(1)  # expect-type: int\n')
+        self.assertEqual(scan(path), [RevealedType(2, FakeBuiltin("int"))])
+
+    def test_ignores_unknown_directives(self):
+        path = self._write("x = 1  # expect-nothing\n")
+        self.assertEqual(scan(path), [])
+
+    def test_rescans_changed_file(self):
+        path = self._write("x = 1\n")
+        self.assertEqual(scan(path), [])
+        path.write_text("x: str = 1  # expect-error\n\n")
+        self.assertEqual(scan(path), [Flaw(1)])
+
+    def test_unsupported_file(self):
+        path = self._write('x = """unterminated\n')
+        with self.assertRaises(UnsupportedFile):
+            scan(path)
@@ -0,0 +1,61 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from typest.session_cache import SessionCache
+from typest.typecheckers import Mypy, Pyright
+
+
+class TestSlot(TestCase):
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.cache = SessionCache(Path(temporary.name))
+
+    def test_concurrent_runs_get_distinct_directories(self):
+        with self.cache.slot("mypy") as first, self.cache.slot("mypy") as second:
+            self.assertNotEqual(first, second)
+            self.assertTrue(first.is_dir() and second.is_dir())
+
+    def test_released_directory_is_reused(self):
+        with self.cache.slot("mypy") as first:
+            pass
+        with self.cache.slot("mypy") as second:
+            self.assertEqual(first, second)
+
+    def test_directories_per_typechecker(self):
+        with self.cache.slot("mypy") as mypy, self.cache.slot("mypy[python-version=3.8]") as cell:
+            self.assertNotEqual(mypy.parent, cell.parent)
+
+    def test_locked_across_instances(self):
+        other = SessionCache(self.cache.directory)
+        with self.cache.slot("mypy") as first, other.slot("mypy") as second:
+            self.assertNotEqual(first, second)
+
+    def test_temporary_directory(self):
+        self.assertTrue(SessionCache().directory.is_dir())
+
+
+class TestCommand(TestCase):
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.cache = SessionCache(Path(temporary.name))
+        Mypy.session_cache = self.cache
+
+    def tearDown(self):
+        del Mypy.session_cache
+
+    def test_mypy_cache_dir(self):
+        with Mypy._command([Path("case.py")]) as command:
+            directory = Path(command[command.index("--cache-dir") + 1])
+            self.assertEqual(directory.parent.parent, self.cache.directory)
+            self.assertIn("--sqlite-cache", command)
+
+    def test_pyright_keeps_no_cache(self):
+        Pyright.session_cache = self.cache
+        try:
+            with Pyright._command([Path("case.py")]) as command:
+                self.assertEqual(command, Pyright.batch_command([Path("case.py")]))
+        finally:
+            del Pyright.session_cache
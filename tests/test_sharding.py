@@ -0,0 +1,88 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from typest.error import RecordedError
+from typest.result import Result, read_results, write_results
+from typest.sharding import load_durations, shard, store_durations
+
+
+class TestShard(TestCase):
+    def setUp(self):
+        self.files = [Path(f"tests/case_{i}.py") for i in range(6)]
+
+    def _shards(self, count: int, durations: dict[str, float]) -> list[list[Path]]:
+        return [shard(self.files, i, count, durations) for i in range(1, count + 1)]
+
+    def test_shards_partition_files(self):
+        shards = self._shards(4, {})
+        self.assertEqual(sorted(f for s in shards for f in s), sorted(self.files))
+
+    def test_deterministic(self):
+        durations = {f.as_posix(): float(i) for i, f in enumerate(self.files)}
+        self.assertEqual(
+            self._shards(3, durations),
+            [shard(list(reversed(self.files)), i, 3, durations) for i in range(1, 4)],
+        )
+
+    def test_balanced_by_durations(self):
+        durations = {"tests/case_0.py": 10.0}
+        durations.update({f.as_posix(): 2.0 for f in self.files[1:]})
+        shards = self._shards(2, durations)
+        self.assertEqual(shards[0], [Path("tests/case_0.py")])
+        self.assertEqual(len(shards[1]), 5)
+
+    def test_unknown_files_get_mean_duration(self):
+        durations = {"tests/case_0.py": 6.0, "tests/case_1.py": 6.0}
+        shards = self._shards(2, durations)
+        self.assertEqual([len(s) for s in shards], [3, 3])
+
+
+class TestDurations(TestCase):
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.path = Path(temporary.name) / "durations"
+
+    def test_missing_file(self):
+        self.assertEqual(load_durations(self.path), {})
+
+    def test_sums_typecheckers_and_keeps_cached(self):
+        self.path.write_text('{"a.py": 1.0, "b.py": 5.0}')
+        store_durations(
+            self.path,
+            [
+                Result(Path("a.py"), "mypy", [], duration=1.5),
+                Result(Path("a.py"), "pyright", [], duration=2.0),
+                Result(Path("b.py"), "mypy", [], duration=None),
+            ],
+        )
+        self.assertEqual(load_durations(self.path), {"a.py": 3.5, "b.py": 5.0})
+
+    def test_keeps_partially_cached(self):
+        self.path.write_text('{"a.py": 4.0}')
+        store_durations(
+            self.path,
+            [
+                Result(Path("a.py"), "mypy", [], duration=1.5),
+                Result(Path("a.py"), "pyright", [], duration=None),
+            ],
+        )
+        self.assertEqual(load_durations(self.path), {"a.py": 4.0})
+
+
+class TestResults(TestCase):
+    def test_round_trip(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        path = Path(temporary.name) / "results.json"
+        errors = [RecordedError(Path("a.py"), 3, "expected int")]
+        write_results(path, [Result(Path("a.py"), "mypy", errors, ".F", duration=1.0)])
+
+        (result,) = read_results(path)
+        self.assertEqual(result.path, Path("a.py"))
+        self.assertEqual(result.progress, ".F")
+        self.assertEqual(result.duration, 1.0)
+        self.assertFalse(result.flawless)
+        self.assertEqual(result.errors[0].linenumber, 3)
+        self.assertEqual(str(result.errors[0]), "expected int")
@@ -0,0 +1,147 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from typest.result import Result
+from typest.snippets import extract, Pack
+from typest.typecheckers.mypy import Mypy
+
+MARKDOWN = """\
+# Title
+
+```python
+x = [1]
+reveal_type(x)  # expect-type: builtins.list[builtins.int]
+```
+
+```bash
+echo "# expect-type: int"
+```
+
+- In a list:
+
+  ```py
+  y = "a"
+  reveal_type(y)  # expect-type: builtins.int
+  ```
+
+```pycon
+>>> z = 1.0
+>>> reveal_type(z)  # expect-type: builtins.float
+1.0
+```
+
+```python
+no_expectations = True
+```
+"""
+
+RST = """\
+Title
+=====
+
+.. code-block:: python
+   :caption: Example
+
+   a = 1
+   reveal_type(a)  # expect-type: builtins.int
+
+Text.
+"""
+
+MODULE = '''\
+def f(x: int) -> str:
+    """Convert.
+
+    >>> s = f(1)
+    >>> reveal_type(s)  # expect-type: builtins.str
+    '1'
+    """
+    return str(x)
+'''
+
+
+class TestExtract(TestCase):
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.directory = Path(temporary.name)
+
+    def _extract(self, name: str, text: str) -> list[list[tuple[int, str]]]:
+        path = self.directory / name
+        path.write_text(text)
+        return [list(snippet.lines) for snippet in extract(path)]
+
+    def test_markdown(self):
+        self.assertEqual(
+            self._extract("README.md", MARKDOWN),
+            [
+                [(4, "x = [1]"), (5, "reveal_type(x)  # expect-type: builtins.list[builtins.int]")],
+                [(15, 'y = "a"'), (16, "reveal_type(y)  # expect-type: builtins.int")],
+                [(20, "z = 1.0"), (21, "reveal_type(z)  # expect-type: builtins.float")],
+            ],
+        )
+
+    def test_rst(self):
+        snippets = self._extract("api.rst", RST)
+        self.assertEqual(len(snippets), 1)
+        self.assertIn((8, "reveal_type(a)  # expect-type: builtins.int"), snippets[0])
+
+    def test_docstring(self):
+        self.assertEqual(
+            self._extract("module.py", MODULE),
+            [[(4, "s = f(1)"), (5, "reveal_type(s)  # expect-type: builtins.str")]],
+        )
+
+    def test_other_files(self):
+        self.assertEqual(self._extract("notes.txt", MARKDOWN), [])
+
+
+class TestPack(TestCase):
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.directory = Path(temporary.name)
+        self.document = self.directory / "README.md"
+        self.document.write_text(MARKDOWN)
+        self.modules = self.directory / "modules"
+        self.modules.mkdir()
+
+    def test_snippets_isolated_in_functions(self):
+        pack = Pack({self.document: extract(self.document)}, self.modules)
+        self.assertEqual(len(pack.modules), 1)
+        self.assertEqual(pack.modules[0].read_text().count("def _snippet_"), 3)
+
+    def test_invalid_snippets_left_out(self):
+        broken = self.directory / "broken.md"
+        broken.write_text("```python\nif True  # expect-error\n```\n")
+        pack = Pack({broken: extract(broken), self.document: extract(self.document)}, self.modules)
+        self.assertEqual(pack.modules[0].read_text().count("def _snippet_"), 3)
+
+    def test_modules_of_limited_size(self):
+        other = self.directory / "other.md"
+        other.write_text(MARKDOWN)
+        snippets = {self.document: extract(self.document), other: extract(other)}
+        self.assertEqual(len(Pack(snippets, self.modules, size=3).modules), 2)
+
+    def test_mypy(self):
+        pack = Pack({self.document: extract(self.document)}, self.modules)
+        ((document, checker),) = pack.checkers(Mypy)
+        self.assertEqual(document, self.document)
+        result = pack.translate(document, Result(checker.path, "mypy", checker.run()))
+        self.assertEqual(result.path, self.document)
+        self.assertEqual([error.linenumber for error in result.errors], [16])
+        self.assertIn("=== LINE 16 ===", str(result.errors[0]))
+
+    def test_classes_named_as_in_snippets(self):
+        document = self.directory / "classes.md"
+        document.write_text(
+            "```python\n"
+            "class Foo: ...\n"
+            "reveal_type(Foo())  # expect-type: Foo\n"
+            "reveal_type([Foo()])  # expect-type: builtins.list[Foo]\n"
+            "```\n"
+        )
+        pack = Pack({document: extract(document)}, self.modules)
+        ((document, checker),) = pack.checkers(Mypy)
+        self.assertEqual(checker.run(), [])
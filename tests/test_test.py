@@ -1,10 +1,82 @@
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
 from pathlib import Path
 
+from typest.typecheckers.dmypy import Dmypy
 from typest.typecheckers.mypy import Mypy
+from typest.typecheckers.mypy_api import _Worker, MypyApi
+from typest.utils.process import Aborted
+from typest.typecheckers.pyright import Pyright
+from typest.typecheckers.pyright_langserver import PyrightLangserver
 
 
 class TestMypy(TestCase):
     def test_run(self):
         errors = Mypy(Path("tests/cases/passing_case.py")).run()
         self.assertEqual(errors, [])
+
+    def test_batch_run_matches_single_runs(self):
+        paths = [Path("tests/cases/passing_case.py"), Path("tests/cases/failing_case.py")]
+        batched = Mypy.batch(paths)
+        for checker, path in zip(batched, paths):
+            self.assertEqual(
+                [repr(error) for error in checker.run()],
+                [repr(error) for error in Mypy(path).run()],
+            )
+
+    def test_durations_only_of_single_runs(self):
+        paths = [Path("tests/cases/passing_case.py"), Path("tests/cases/failing_case.py")]
+        # The invocation's time cannot be told apart per file of a batch
+        self.assertEqual([checker.duration for checker in Mypy.batch(paths)], [None, None])
+        checker = Mypy(paths[0])
+        checker.run()
+        self.assertIsNotNone(checker.duration)
+
+    def test_batch_falls_back_on_blocking_errors(self):
+        # Files of the same module name block each other in a single run
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        directory = Path(temporary.name)
+        paths = [directory / "a" / "case.py", directory / "b" / "case.py"]
+        for path in paths:
+            path.parent.mkdir()
+            path.write_text("x: int = 1\nreveal_type(x)  # expect-type: int\n")
+        for checker in Mypy.batch(paths):
+            self.assertEqual(checker.run(), [])
+
+
+class TestDmypy(TestCase):
+    def test_run_matches_mypy(self):
+        path = Path("tests/cases/failing_case.py")
+        self.assertEqual(
+            [repr(error) for error in Dmypy(path).run()],
+            [repr(error) for error in Mypy(path).run()],
+        )
+
+
+class TestPyrightLangserver(TestCase):
+    def test_run_matches_pyright(self):
+        path = Path("tests/cases/failing_case.py")
+        self.assertEqual(
+            [repr(error) for error in PyrightLangserver(path).run()],
+            [repr(error) for error in Pyright(path).run()],
+        )
+
+
+class TestMypyApi(TestCase):
+    def test_run_matches_mypy(self):
+        for path in [Path("tests/cases/passing_case.py"), Path("tests/cases/failing_case.py")]:
+            self.assertEqual(
+                [repr(error) for error in MypyApi(path).run()],
+                [repr(error) for error in Mypy(path).run()],
+            )
+
+    def test_timeout_aborts_only_its_own_run(self):
+        path = "tests/cases/passing_case.py"
+        with ThreadPoolExecutor() as executor:
+            other = executor.submit(_Worker().run, [path], None)
+            with self.assertRaisesRegex(Aborted, "timed out"):
+                _Worker().run([path], 0.001)
+            output, returncode = other.result()
+        self.assertIn("passing_case.py", output)
@@ -0,0 +1,33 @@
+import time
+from unittest import TestCase
+
+from typest.utils.timing import Timings
+
+
+class TestTimings(TestCase):
+    def setUp(self):
+        self.timings = Timings()
+        with self.timings.measure("matching", "mypy", "fast.py"):
+            pass
+        with self.timings.measure("matching", "mypy", "slow.py"):
+            time.sleep(0.01)
+
+    def test_records_spans(self):
+        span = self.timings.spans[1]
+        self.assertEqual(
+            (span.stage, span.typechecker, span.label), ("matching", "mypy", "slow.py")
+        )
+        self.assertGreaterEqual(span.wall, 0.01)
+        self.assertIsNotNone(span.cpu)
+
+    def test_durations_lists_slowest_first(self):
+        # Under load, even the empty span may take as long as the sleep
+        self.timings.spans[0].wall = 0.0
+        lines = self.timings.durations(1).split("\n")
+        self.assertEqual(len(lines), 2)
+        self.assertIn("slow.py", lines[1])
+
+    def test_chrome_trace(self):
+        events = self.timings.chrome_trace()["traceEvents"]
+        self.assertEqual([event["args"]["file"] for event in events], ["fast.py", "slow.py"])
+        self.assertEqual({event["ph"] for event in events}, {"X"})
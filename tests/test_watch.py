@@ -0,0 +1,59 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from typest.utils.imports import local_imports
+from typest.watch import Watcher
+
+
+def _touch(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestPoll(TestCase):
+    def setUp(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.directory = Path(temporary.name)
+        self.module = self.directory / "module.py"
+        self.module.write_text("y = 1\n")
+        self.importing = self.directory / "importing_case.py"
+        self.importing.write_text("from module import y\n")
+        self.other = self.directory / "other_case.py"
+        self.other.write_text("z = 1\n")
+        self.watcher = Watcher(self.directory)
+
+    def test_nothing_changed(self):
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_changed_test_file(self):
+        _touch(self.other)
+        self.assertEqual(self.watcher.poll(), [self.other.resolve()])
+
+    def test_changed_imported_module(self):
+        _touch(self.module)
+        self.assertIn(self.importing.resolve(), self.watcher.poll())
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_new_test_file(self):
+        new = self.directory / "new_case.py"
+        new.write_text("a = 1\n")
+        self.assertEqual(self.watcher.poll(), [new.resolve()])
+
+    def test_change_while_polling(self):
+        touched = []
+
+        def touching_imports(testfile):
+            # The module changes while the imports of the test file are read
+            if not touched:
+                _touch(self.module)
+                touched.append(testfile)
+            return local_imports(testfile)
+
+        _touch(self.other)
+        with patch("typest.watch.local_imports", touching_imports):
+            self.assertEqual(self.watcher.poll(), [self.other.resolve()])
+        self.assertIn(self.importing.resolve(), self.watcher.poll())
@@ -0,0 +1,120 @@
+import json
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from typest.outcomes import Flaw, RevealedType
+from typest.outcomes.mismatch import Mismatch
+from typest.typecheckers.mypy import Mypy
+from typest.typecheckers.pyright import Pyright
+from typest.utils.fake_type import parse
+
+
+PATH = Path("tests/cases/passing_case.py")
+
+
+def route(typechecker, output):
+    """Outcomes per file of the typechecker's output on PATH"""
+    diagnostics = typechecker._diagnostics(output.splitlines(keepends=True))
+    return dict(typechecker._route([PATH], diagnostics))
+
+
+class TestMypy(TestCase):
+    expected = {
+        PATH: {
+            11: [RevealedType(11, parse("int | str"))],
+            15: [Flaw(15), Mismatch(15, parse("Union[int, str]"), parse("str"))],
+            16: [Flaw(16)],
+        }
+    }
+
+    def test_classifies_lines(self):
+        lines = [
+            f'{PATH}:11: note: Revealed type is "Union[builtins.int, builtins.str]"',
+            f"{PATH}:15: error: Incompatible types in assignment (expression has type "
+            '"Union[int, str]", variable has type "str")  [assignment]',
+            f"{PATH}:16: error: Name 'x' is not defined",
+            "other.py:1: error: Name 'x' is not defined",
+            "Found 2 errors in 1 file (checked 1 source file)",
+        ]
+        with patch.object(Mypy, "_json_output", return_value=False):
+            outcomes = route(Mypy, "\n".join(lines).encode())
+        self.assertEqual(outcomes, self.expected)
+
+    def test_classifies_json_lines(self):
+        diagnostics = [
+            (11, "note", 'Revealed type is "Union[builtins.int, builtins.str]"'),
+            (
+                15,
+                "error",
+                'Incompatible types in assignment (expression has type "Union[int, str]", '
+                'variable has type "str")',
+            ),
+            (16, "error", "Name 'x' is not defined"),
+        ]
+        output = "\n".join(
+            json.dumps({"file": str(PATH), "line": line, "severity": severity, "message": message})
+            for line, severity, message in diagnostics
+        )
+        with patch.object(Mypy, "_json_output", return_value=True):
+            outcomes = route(Mypy, output.encode())
+        self.assertEqual(outcomes, self.expected)
+
+
+class TestPyright(TestCase):
+    def test_classifies_diagnostics(self):
+        def diagnostic(line, severity, message):
+            return {
+                "file": str(PATH.resolve()),
+                "severity": severity,
+                "message": message,
+                "range": {"start": {"line": line - 1, "character": 12}},
+            }
+
+        output = json.dumps(
+            {
+                "generalDiagnostics": [
+                    diagnostic(11, "information", 'Type of "c" is "int | str"'),
+                    diagnostic(
+                        15,
+                        "error",
+                        'Expression of type "int | str" cannot be assigned to declared type '
+                        '"str"\n  Type "int | str" is not assignable to type "str"',
+                    ),
+                    diagnostic(16, "warning", "Import could not be resolved"),
+                ]
+            }
+        )
+        self.assertEqual(
+            route(Pyright, output.encode()),
+            {
+                PATH: {
+                    11: [RevealedType(11, parse("int | str"))],
+                    15: [Flaw(15), Mismatch(15, parse("str"), parse("int | str"))],
+                }
+            },
+        )
+
+    def test_ignores_invalid_output(self):
+        self.assertEqual(route(Pyright, b"No configuration file found."), {PATH: {}})
+
+
+class TestRoute(TestCase):
+    def test_yields_outcomes_of_file_before_output_is_finished(self):
+        first, second = Path("first_case.py"), Path("second_case.py")
+        consumed = []
+
+        def output():
+            for line in [b"first_case.py:1: error: x\n", b"second_case.py:2: error: y\n"]:
+                consumed.append(line)
+                yield line
+
+        with patch.object(Mypy, "_json_output", return_value=False):
+            stream = Mypy._route([first, second], Mypy._diagnostics(output()))
+            self.assertEqual(next(stream), (first, {1: [Flaw(1)]}))
+            self.assertEqual(len(consumed), 2)
+            self.assertEqual(list(stream), [(second, {2: [Flaw(2)]})])
+
+    def test_yields_files_without_diagnostics_at_the_end(self):
+        stream = Pyright._route([PATH], iter([]))
+        self.assertEqual(list(stream), [(PATH, {})])
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+from typest import typecheckers
+from typest.typecheckers.mypy import Mypy
+from typest.typecheckers.pyright import Pyright
+from typest.typecheckers.pyright_langserver import PyrightLangserver
+
+
+class TestSelect(TestCase):
+    def test_default(self):
+        self.assertEqual(typecheckers.select(), [Mypy, Pyright])
+
+    def test_by_name(self):
+        self.assertEqual(
+            typecheckers.select(["pyright-langserver", "mypy"]), [Mypy, PyrightLangserver]
+        )
+
+    def test_unknown_name(self):
+        self.assertEqual(typecheckers.select(["pytype"]), [])
+
+    def test_class_name_attribute(self):
+        self.assertIs(typecheckers.Mypy, Mypy)
+        with self.assertRaises(AttributeError):
+            typecheckers.Pytype
+
+    def test_backends_imported_lazily(self):
+        code = (
+            "import sys, typest.__main__\n"
+            "print(sorted(m for m in sys.modules if m.startswith('typest.typecheckers.')))"
+        )
+        output = subprocess.run([sys.executable, "-c", code], stdout=subprocess.PIPE, check=True)
+        self.assertEqual(output.stdout.decode().strip(), "['typest.typecheckers.base']")
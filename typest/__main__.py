@@ -1,68 +1,176 @@
 import argparse
+import json
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain
 from typing import Type
 from pathlib import Path
 
-from comment_parser import comment_parser
+from typest.cache import Cache
+from typest.typecheckers.base import Aborted, NoTestFound
+from typest.history import History
+from typest.import_index import changed_since, ImportIndex
+from typest.matrix import differences, parse_cell
+from typest.reporters import REPORTERS, Reporter, open_reporter
+from typest.result import Result, read_results, write_results
+from typest.session_cache import SessionCache
+from typest.snippets import (
+    DOCUMENT_SUFFIXES,
+    extract,
+    modules_directory,
+    Pack,
+    Snippet,
+)
+from typest.sharding import load_durations, shard, store_durations
+from typest.typecheckers import select, TypeChecker
+from typest.utils.files import relative
+from typest.utils.scanner import UnsupportedFile
+from typest.utils.timing import Timings
+from typest.watch import Watcher
+
 
-from typest.typecheckers.base import NoTestFound
-from typest.typecheckers import TypeChecker
-from typest.utils.color import Color
+def _chunks(files: list[Path], count: int) -> list[list[Path]]:
+    size = -(-len(files) // count) or 1
+    return [files[i : i + size] for i in range(0, len(files), size)]
 
 
-def _run_file(typechecker: Type[TypeChecker], path: Path) -> bool:
-    # Use relative paths when possible, only for visualization's sake
-    if path.is_relative_to(Path.cwd()):
-        path = path.relative_to(Path.cwd())
+def _execute(typechecker: TypeChecker) -> Result:
+    path = typechecker.path
 
     try:
-        errors = typechecker(path).run()
+        errors = typechecker.run()
     except NoTestFound:
-        print(
-            Color.WARN.value
-            + f"{path} "
-            + Color.RESET.value
-            + f"no tests found"
+        return Result(path, typechecker.name, [], skipped="no tests found")
+    except UnsupportedFile:
+        return Result(
+            path,
+            typechecker.name,
+            [],
+            skipped="file could not be tokenized",
         )
+    except Aborted as error:
+        return Result(path, typechecker.name, [], aborted=str(error))
+    return Result(
+        path,
+        typechecker.name,
+        errors,
+        typechecker.progress,
+        duration=typechecker.duration,
+    )
 
-        return True
-    except comment_parser.UnsupportedError:
-        print(
-            Color.WARN.value
-            + f"{path} "
-            + Color.RESET.value
-            + f"file format not supported or file empty"
-        )
-        return True
-    if errors:
-        print(f"{Color.ALERT.value}{path} {Color.RESET.value}")
-        for error in errors:
-            print(error)
-        return False
-    else:
-        print(f"{Color.OK.value}{path} {Color.RESET.value}")
-        return True
+
+def _stream_batch(
+    typechecker: Type[TypeChecker],
+    paths: list[Path],
+    slots: dict[Path, "Future[Result]"],
+) -> None:
+    """Run the typechecker once over the paths, filling in the result of each
+    file into its slot as soon as the outcomes of the file are known"""
+    try:
+        for checker in typechecker.iter_batch(paths):
+            slots[checker.path].set_result(_execute(checker))
+    except BaseException as error:
+        for slot in slots.values():
+            if not slot.done():
+                slot.set_exception(error)
+        raise
 
 
-def _run_file_typecheckers(
-    typecheckers: list[Type[TypeChecker]], path: Path
-) -> bool:
-    flawless = True
-    for typechecker in typecheckers:
-        print(f"Running tests against {typechecker.name}")
-        if not _run_file(typechecker, path):
-            flawless = False
-        print("\n")
-    return flawless
+def _run_files(
+    typecheckers: list[Type[TypeChecker]],
+    files: list[Path],
+    batch: bool,
+    jobs: int,
+    reporter: Reporter,
+    history: History | None = None,
+    failed: list[Path] | None = None,
+) -> list[Result]:
+    """Run the typecheckers on the files. Runs of the `failed` files are
+    started first, then the others, each longest first if their durations
+    are in the history."""
+    files = [relative(file) for file in files]
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        if batch:
+            columns: list[dict[Path, Future[Result]]] = [
+                {file: Future() for file in files} for _ in typecheckers
+            ]
+            # Submit the batches of all typecheckers before waiting for any
+            for typechecker, column in zip(typecheckers, columns):
+                for chunk in _chunks(files, jobs):
+                    executor.submit(
+                        _stream_batch,
+                        typechecker,
+                        chunk,
+                        {file: column[file] for file in chunk},
+                    )
+            futures = [column[file] for file in files for column in columns]
+        else:
+            rows = [
+                typechecker(file)
+                for file in files
+                for typechecker in typecheckers
+            ]
+            order = list(range(len(rows)))
+            if history is not None and jobs > 1:
+                # Start the longest runs first, so that none of them is left
+                # to run alone at the end
+                order = history.longest_first(
+                    [(checker.path, checker.name) for checker in rows]
+                )
+            if failed:
+                # Sorting is stable, so each group stays longest first
+                first = {relative(path) for path in failed}
+                order.sort(key=lambda i: rows[i].path not in first)
+            submitted = {i: executor.submit(_execute, rows[i]) for i in order}
+            futures = [submitted[i] for i in range(len(rows))]
 
+        # Results are reported in order of files, then typecheckers, no matter
+        # in which order they are completed. Each is reported as soon as it
+        # and the ones before are known.
+        results = []
+        for future in futures:
+            result = future.result()
+            reporter.report(result)
+            results.append(result)
+    if history is not None:
+        history.record(results)
+    return results
 
-def _run_dir(typecheckers: list[Type[TypeChecker]], path: Path) -> bool:
-    flawless = True
 
-    for file in path.rglob("*.py"):
-        if not _run_file_typecheckers(typecheckers, file):
-            flawless = False
-    return flawless
+def _run_documents(
+    typecheckers: list[Type[TypeChecker]],
+    snippets: dict[Path, list[Snippet]],
+    jobs: int,
+    reporter: Reporter,
+    history: History | None = None,
+) -> list[Result]:
+    directory = modules_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    pack = Pack(snippets, directory)
+    # Each typechecker is invoked once for the snippets of all documents
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        columns = list(executor.map(pack.checkers, typecheckers))
+
+    results = []
+    for row in zip(*columns):
+        for document, checker in row:
+            result = pack.translate(relative(document), _execute(checker))
+            reporter.report(result)
+            results.append(result)
+    if history is not None:
+        history.record(results)
+    return results
+
+
+def _shard_spec(value: str) -> tuple[int, int]:
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected the form i/N, e.g. 1/4")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError("expected 1 <= i <= N")
+    return index, count
 
 
 parser = argparse.ArgumentParser(
@@ -84,26 +192,345 @@ parser.add_argument(
     default=None,
 )
 
+parser.add_argument(
+    "-j",
+    "--jobs",
+    type=int,
+    default=None,
+    help="number of typechecker runs executed in parallel (default: 1, or the "
+    "number of matrix cells)",
+)
+
+parser.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="always invoke the typecheckers, ignoring cached outcomes",
+)
+
+parser.add_argument(
+    "--session-cache",
+    type=Path,
+    default=Path(".typest_cache") / "session",
+    metavar="DIR",
+    help="keep the typecheckers' own caches in this directory (default: "
+    ".typest_cache/session)",
+)
+
+parser.add_argument(
+    "--timeout",
+    type=float,
+    default=None,
+    metavar="SECONDS",
+    help="abort typechecker runs taking longer than this",
+)
+
+parser.add_argument(
+    "--memory-limit",
+    type=int,
+    default=None,
+    metavar="MB",
+    help="limit the address space of typechecker runs (Linux only)",
+)
+
+parser.add_argument(
+    "--cpu-limit",
+    type=int,
+    default=None,
+    metavar="SECONDS",
+    help="limit the CPU time of typechecker runs (Linux only)",
+)
+
+parser.add_argument(
+    "--watch",
+    action="store_true",
+    help="keep running, rerunning the tests affected by changed files",
+)
+
+parser.add_argument(
+    "--durations",
+    type=int,
+    default=None,
+    metavar="N",
+    help="show the N slowest files and typecheckers (N=0 for all)",
+)
+
+parser.add_argument(
+    "--trace",
+    type=Path,
+    default=None,
+    help="write timings of all stages as a Chrome trace to this JSON file",
+)
+
+parser.add_argument(
+    "--batch",
+    action="store_true",
+    help="invoke each typechecker only once for all files in a directory",
+)
+
+parser.add_argument(
+    "--snippets",
+    action="store_true",
+    help="also check the snippets in Markdown and reStructuredText documents "
+    "and in docstrings",
+)
+
+parser.add_argument(
+    "--changed-since",
+    default=None,
+    metavar="REF",
+    help="run only the test files which changed since the git ref, or import "
+    "a module which did",
+)
+
+parser.add_argument(
+    "--lf",
+    "--last-failed",
+    dest="last_failed",
+    action="store_true",
+    help="run only the test files which failed last time, or all if none did",
+)
+
+parser.add_argument(
+    "--ff",
+    "--failed-first",
+    dest="failed_first",
+    action="store_true",
+    help="run the test files which failed last time first, then the others",
+)
+
+parser.add_argument(
+    "--shard",
+    type=_shard_spec,
+    default=None,
+    metavar="i/N",
+    help="run only the i-th of N shards, balanced by recorded durations",
+)
+
+parser.add_argument(
+    "--durations-file",
+    type=Path,
+    default=Path(".typest_durations"),
+    help="file of recorded durations per test file used for sharding",
+)
+
+parser.add_argument(
+    "--store-durations",
+    action="store_true",
+    help="record the durations of this run in the durations file",
+)
+
+parser.add_argument(
+    "--results",
+    type=Path,
+    default=None,
+    help="write the results of this run to this JSON file, e.g. per shard",
+)
+
+parser.add_argument(
+    "--merge",
+    type=Path,
+    nargs="+",
+    default=None,
+    metavar="RESULTS",
+    help="report the results of several --results files instead of running",
+)
+
+parser.add_argument(
+    "--format",
+    choices=sorted(REPORTERS),
+    default="terminal",
+    help="format of the reported results",
+)
+
+parser.add_argument(
+    "-o",
+    "--output",
+    type=Path,
+    default=None,
+    help="write the reported results to this file instead of stdout",
+)
+
+parser.add_argument(
+    "-q",
+    "--quiet",
+    action="store_true",
+    help="report only the results with errors",
+)
+
+parser.add_argument(
+    "--matrix",
+    action="append",
+    default=None,
+    metavar="CELL",
+    help="run a typechecker with other settings, given as NAME[:SETTING=VALUE"
+    ",...] with settings executable, python-version and config-file; repeat "
+    "for each cell of the matrix",
+)
+
+
 if __name__ == "__main__":
-    typecheckers = TypeChecker.__subclasses__()
     args = parser.parse_args()
-    if args.typechecker is not None:
-        names = args.typechecker.split(",")
-        typecheckers = [
-            typechecker
-            for typechecker in typecheckers
-            if typechecker.name in names
-        ]
+    if args.matrix is not None:
+        try:
+            typecheckers = [parse_cell(cell) for cell in args.matrix]
+        except ValueError as error:
+            parser.error(str(error))
+        # Matrix cells run concurrently, unless told otherwise
+        if args.jobs is None:
+            args.jobs = len(typecheckers)
+    else:
+        typecheckers = select(
+            args.typechecker.split(",")
+            if args.typechecker is not None
+            else None
+        )
+    if args.jobs is None:
+        args.jobs = 1
+
+    if not args.no_cache:
+        TypeChecker.cache = Cache(Path.cwd() / ".typest_cache")
+    TypeChecker.session_cache = SessionCache(args.session_cache)
+    TypeChecker.timeout = args.timeout
+    TypeChecker.cpu_limit = args.cpu_limit
+    if args.memory_limit is not None:
+        TypeChecker.memory_limit = args.memory_limit * 2**20
+    if args.durations is not None or args.trace is not None:
+        TypeChecker.timings = Timings()
 
     target_path: Path = args.path
-    flawless = True
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    reporter = open_reporter(args.format, args.output, args.quiet)
+
+    if args.merge is not None:
+        # Sorting is stable, so typecheckers keep their order within a file
+        merged = sorted(
+            chain.from_iterable(read_results(path) for path in args.merge),
+            key=lambda result: result.path.as_posix(),
+        )
+        for result in merged:
+            reporter.report(result)
+        reporter.close()
+        if args.store_durations:
+            store_durations(args.durations_file, merged)
+        if not all(result.flawless for result in merged):
+            sys.exit(1)
+        sys.exit(0)
+
+    # Start watching before the first run, not to miss changes during the run
+    watcher = Watcher(target_path) if args.watch else None
+
+    files: list[Path] = []
+    documents: list[Path] = []
     if target_path.is_file():
-        if target_path.suffix != ".py":
-            print("file path must be a python file")
+        if target_path.suffix in DOCUMENT_SUFFIXES:
+            documents = [target_path]
+        elif target_path.suffix != ".py":
+            print(
+                "file path must be a python file, or a document",
+                file=sys.stderr,
+            )
         else:
-            flawless = _run_file_typecheckers(typecheckers, target_path)
+            files = [target_path]
+            if args.snippets:
+                documents = [target_path]
     else:
-        flawless = _run_dir(typecheckers, target_path)
+        files = sorted(target_path.rglob("*.py"))
+        if args.snippets:
+            documents = [
+                document
+                for suffix in (".py", *DOCUMENT_SUFFIXES)
+                for document in sorted(target_path.rglob(f"*{suffix}"))
+                if extract(document)
+            ]
+
+    if args.changed_since is not None:
+        try:
+            changed = changed_since(args.changed_since)
+        except ValueError as error:
+            parser.error(str(error))
+        import_index = ImportIndex(
+            Path.cwd() / ".typest_cache" / "imports.json"
+        )
+        for paths in (files, documents):
+            paths[:] = import_index.affected(paths, changed)
+        import_index.save()
+
+    if args.shard is not None:
+        index, count = args.shard
+        durations = load_durations(args.durations_file)
+        for paths in (files, documents):
+            paths[:] = shard(paths, index, count, durations)
+
+    history = History(Path.cwd() / ".typest_cache" / "history.sqlite")
+    # Test files which failed last time with any of the typecheckers
+    failed_files: list[Path] = []
+    if args.last_failed or args.failed_first:
+        names = [typechecker.name for typechecker in typecheckers]
+        failed_files = history.failed(files, names)
+        for paths, failed in (
+            (files, failed_files),
+            (documents, history.failed(documents, names)),
+        ):
+            if args.last_failed and failed:
+                paths[:] = failed
+            elif args.failed_first:
+                paths[:] = failed + [
+                    path for path in paths if path not in failed
+                ]
+
+    results = _run_files(
+        typecheckers,
+        files,
+        args.batch,
+        args.jobs,
+        reporter,
+        history,
+        failed_files,
+    )
+    if documents:
+        snippets = {document: extract(document) for document in documents}
+        results += _run_documents(
+            typecheckers, snippets, args.jobs, reporter, history
+        )
+    flawless = all(result.flawless for result in results)
+    if args.results is not None:
+        write_results(args.results, results)
+    if args.store_durations:
+        store_durations(args.durations_file, results)
+
+    if watcher is not None:
+        try:
+            for affected in watcher.changes():
+                print(
+                    f"Rerunning {len(affected)} affected test file(s)\n",
+                    file=sys.stderr,
+                )
+                _run_files(
+                    typecheckers,
+                    affected,
+                    args.batch,
+                    args.jobs,
+                    reporter,
+                    history,
+                )
+        except KeyboardInterrupt:
+            pass
+    reporter.close()
+
+    if args.matrix is not None:
+        print(differences(results), file=sys.stderr)
+
+    if TypeChecker.timings is not None:
+        if args.durations is not None:
+            print(
+                TypeChecker.timings.durations(args.durations), file=sys.stderr
+            )
+        if args.trace is not None:
+            args.trace.write_text(
+                json.dumps(TypeChecker.timings.chrome_trace())
+            )
 
     if not flawless:
         sys.exit(1)
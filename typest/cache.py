@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+from subprocess import DEVNULL, PIPE, run
+from threading import Lock
+from typing import Type, TYPE_CHECKING
+
+from typest.outcomes import Outcome
+from typest.utils.files import write_atomically
+from typest.utils.imports import local_imports
+
+if TYPE_CHECKING:
+    from typest.typecheckers.base import TypeChecker
+
+
+# Bump whenever the format of the cached outcomes changes
+_FORMAT = 2
+
+
+def _digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class Cache:
+    """On-disk cache of the outcomes of typechecker runs, keyed by the content
+    of the test file and of everything else the outcomes depend on. The least
+    recently used entries are evicted when the cache exceeds `max_size`
+    bytes."""
+
+    def __init__(self, directory: Path, max_size: int = 64 * 2**20) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self._versions: dict[str, str] = {}
+        self._lock = Lock()
+
+    def _version(self, typechecker: Type["TypeChecker"]) -> str:
+        """Version of the typechecker, which is looked up only once per
+        installation of its executable, and kept in the cache directory.
+        Typecheckers which can tell their version without running, e.g. from
+        the metadata of their package, are not looked up at all."""
+        version = typechecker.installed_version()
+        if version is not None:
+            return version
+
+        command = typechecker.version_command()
+        executable = shutil.which(command[0])
+        if executable is None:
+            return ""
+        resolved = Path(executable).resolve()
+        stat = resolved.stat()
+        marker = f"{resolved}:{stat.st_mtime_ns}:{' '.join(command[1:])}"
+        # Parallel runs wait for the first one to look the version up
+        with self._lock:
+            if marker not in self._versions:
+                self._versions[marker] = self._stored_version(marker, command)
+            return self._versions[marker]
+
+    def _stored_version(self, marker: str, command: list[str]) -> str:
+        versions_file = self.directory / "versions.json"
+        try:
+            versions = json.loads(versions_file.read_text())
+        except (OSError, ValueError):
+            versions = {}
+        if marker not in versions:
+            try:
+                output = run(command, stdout=PIPE, stderr=DEVNULL).stdout
+            except OSError:
+                output = b""
+            versions[marker] = output.decode("utf-8").strip()
+            write_atomically(versions_file, json.dumps(versions).encode())
+        return versions[marker]
+
+    def key(self, typechecker: Type["TypeChecker"], path: Path) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{_FORMAT}:{typechecker.name}:".encode("utf-8"))
+        digest.update(self._version(typechecker).encode("utf-8"))
+        # Typecheckers report types qualified by the module of the file, so
+        # files of the same content have outcomes of their own
+        digest.update(f"{path.resolve()}:{_digest(path)}".encode("utf-8"))
+        for module in sorted(local_imports(path)):
+            digest.update(f"{module}:{_digest(module)}".encode("utf-8"))
+        for name in typechecker.config_files:
+            config = Path.cwd() / name
+            if config.is_file():
+                digest.update(f"{name}:{_digest(config)}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict[int, list[Outcome]] | None:
+        entry = self.directory / f"{key}.pickle"
+        try:
+            with entry.open("rb") as file:
+                outcomes = pickle.load(file)
+            os.utime(entry)
+        except Exception:
+            # Missing, outdated or corrupt entries are misses alike
+            return None
+        return outcomes
+
+    def set(self, key: str, outcomes: dict[int, list[Outcome]]) -> None:
+        write_atomically(
+            self.directory / f"{key}.pickle", pickle.dumps(outcomes)
+        )
+
+    def evict(self) -> None:
+        entries = []
+        for entry in self.directory.glob("*.pickle"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, entry in sorted(entries):
+            if size <= self.max_size:
+                break
+            entry.unlink(missing_ok=True)
+            size -= entry_size
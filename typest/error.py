@@ -26,22 +26,26 @@ class Error:
         return f"Error({self.path}, {self.expected}, {self.actual})"
 
     def __str__(self) -> str:
+        return self.format()
+
+    def format(self, colored: bool = True) -> str:
+        def paint(text: str, color: Color) -> str:
+            if not colored:
+                return text
+            return color.value + text + Color.RESET.value
+
         msg = f"=== LINE {self.linenumber} ===\n"
 
         if isinstance(self.expected, RevealedType):
             msg += (
                 self._pad("Expected type")
-                + Color.ALERT.value
-                + str(self.expected._type)
-                + Color.RESET.value
+                + paint(str(self.expected._type), Color.ALERT)
                 + "\n"
             )
             if isinstance(self.actual, RevealedType):
                 msg += (
                     self._pad("Found type")
-                    + Color.OK.value
-                    + str(self.actual._type)
-                    + Color.RESET.value
+                    + paint(str(self.actual._type), Color.OK)
                     + "\n"
                 )
             else:
@@ -56,3 +60,21 @@ class Error:
                 msg += f"No error found.\n"
 
         return msg
+
+
+class RecordedError:
+    """Test error read back from a results file, holding only its message"""
+
+    def __init__(self, path: Path, linenumber: int, message: str) -> None:
+        self.path = path
+        self.linenumber = linenumber
+        self.message = message
+
+    def __repr__(self) -> str:
+        return f"RecordedError({self.path}, {self.linenumber})"
+
+    def __str__(self) -> str:
+        return self.format()
+
+    def format(self, colored: bool = True) -> str:
+        return self.message
@@ -0,0 +1,88 @@
+import sqlite3
+from pathlib import Path
+
+from typest.result import Result
+from typest.utils.files import resolved_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    path TEXT NOT NULL,
+    typechecker TEXT NOT NULL,
+    duration REAL,
+    failed INTEGER NOT NULL,
+    PRIMARY KEY (path, typechecker)
+)
+"""
+
+
+class History:
+    """Local database of the latest result of each test file and typechecker:
+    whether it failed, and how long it took"""
+
+    def __init__(self, file: Path) -> None:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        # Parallel sessions wait for each other's writes
+        self._connection = sqlite3.connect(file, timeout=30)
+        with self._connection:
+            self._connection.execute(_SCHEMA)
+
+    def record(self, results: list[Result]) -> None:
+        """Store the results. Durations of cached outcomes and of outcomes
+        checked in a batch are unknown, so the previous durations are kept for
+        them."""
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO runs VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (path, typechecker) DO UPDATE SET "
+                "duration = COALESCE(excluded.duration, duration), "
+                "failed = excluded.failed",
+                [
+                    (
+                        resolved_key(result.path),
+                        result.typechecker,
+                        result.duration,
+                        not result.flawless,
+                    )
+                    for result in results
+                ],
+            )
+
+    def failed(self, files: list[Path], typecheckers: list[str]) -> list[Path]:
+        """Those of the files which failed with any of the typecheckers, given
+        by name, last time"""
+        placeholders = ", ".join("?" for _ in typecheckers)
+        failed = {
+            path
+            for (path,) in self._connection.execute(
+                "SELECT DISTINCT path FROM runs WHERE failed "
+                f"AND typechecker IN ({placeholders})",
+                typecheckers,
+            )
+        }
+        return [file for file in files if resolved_key(file) in failed]
+
+    def durations(self) -> dict[tuple[str, str], float]:
+        """Latest known duration per file and typechecker, keyed by the
+        resolved path of the file and the typechecker's name"""
+        return {
+            (path, typechecker): duration
+            for path, typechecker, duration in self._connection.execute(
+                "SELECT path, typechecker, duration FROM runs "
+                "WHERE duration IS NOT NULL"
+            )
+        }
+
+    def longest_first(self, runs: list[tuple[Path, str]]) -> list[int]:
+        """Indices of the runs of a file by a typechecker, ordered by their
+        latest known durations, longest first. Runs of unknown duration come
+        before all others."""
+        durations = self.durations()
+        return sorted(
+            range(len(runs)),
+            key=lambda i: -durations.get(
+                (resolved_key(runs[i][0]), runs[i][1]), float("inf")
+            ),
+        )
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,110 @@
+import hashlib
+import json
+from pathlib import Path
+from subprocess import CalledProcessError, DEVNULL, PIPE, run
+from typing import Any
+
+from typest.utils.files import write_atomically
+from typest.utils.imports import direct_imports
+
+# Bump whenever the format of the index changes
+_FORMAT = 2
+
+
+class ImportIndex:
+    """Persistent index of the local modules imported by test files and by the
+    modules they import, directly or transitively. Entries are only updated
+    for files whose mtime and size changed, and only reparsed if their content
+    changed as well."""
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        try:
+            data = json.loads(file.read_text())
+        except (OSError, ValueError):
+            data = {}
+        self._entries: dict[str, dict[str, Any]] = (
+            data.get("files", {}) if data.get("format") == _FORMAT else {}
+        )
+        self._visited: set[str] = set()
+
+    def _direct(self, path: Path) -> set[Path]:
+        key = path.as_posix()
+        self._visited.add(key)
+        entry = self._entries.get(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._entries.pop(key, None)
+            return set()
+        if (
+            entry is not None
+            and entry["mtime"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            return {Path(file) for file in entry["imports"]}
+
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if entry is None or entry["digest"] != digest:
+            imports = direct_imports(path, [Path.cwd(), path.parent])
+            entry = {
+                "digest": digest,
+                "imports": sorted(file.as_posix() for file in imports),
+            }
+        entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+        self._entries[key] = entry
+        return {Path(file) for file in entry["imports"]}
+
+    def imports(self, path: Path) -> set[Path]:
+        """Files of all local modules imported by the python file, directly or
+        transitively"""
+        path = path.resolve()
+        found: set[Path] = set()
+        pending = [path]
+        while pending:
+            for file in self._direct(pending.pop()):
+                if file not in found and file != path:
+                    found.add(file)
+                    pending.append(file)
+        return found
+
+    def affected(self, testfiles: list[Path], changed: set[Path]) -> list[Path]:
+        """Those of the test files which changed themselves or import a changed
+        module, given as resolved paths"""
+        return [
+            testfile
+            for testfile in testfiles
+            # Imports first, to keep the index complete
+            if not self.imports(testfile).isdisjoint(changed)
+            or testfile.resolve() in changed
+        ]
+
+    def save(self) -> None:
+        """Store the entries of the files visited since loading. Entries of
+        files which are not imported anymore are dropped."""
+        entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if key in self._visited
+        }
+        content = json.dumps({"format": _FORMAT, "files": entries})
+        write_atomically(self.file, content.encode("utf-8"))
+
+
+def changed_since(ref: str) -> set[Path]:
+    """Resolved paths of the files changed in the working tree since the git
+    ref, including untracked files. Raises ValueError if git fails."""
+
+    def git(*args: str) -> list[str]:
+        try:
+            output = run(
+                ["git", *args], stdout=PIPE, stderr=DEVNULL, check=True
+            ).stdout
+        except (CalledProcessError, OSError) as error:
+            raise ValueError(f"could not list changes since {ref}") from error
+        return output.decode("utf-8").splitlines()
+
+    (toplevel,) = git("rev-parse", "--show-toplevel")
+    names = git("diff", "--name-only", ref, "--")
+    names += git("ls-files", "--others", "--exclude-standard", "--full-name")
+    return {(Path(toplevel) / name).resolve() for name in names}
@@ -0,0 +1,56 @@
+from collections import defaultdict
+from pathlib import Path
+from typing import Type
+
+from typest.result import Result
+from typest.typecheckers import available, select, TypeChecker
+
+
+def parse_cell(spec: str) -> Type[TypeChecker]:
+    """Matrix cell described as `NAME[:SETTING=VALUE,...]`, e.g.
+    `mypy:python-version=3.8,config-file=strict.ini`. Raises ValueError for
+    unknown typecheckers and malformed or unsupported settings."""
+    name, _, options = spec.partition(":")
+    typecheckers = select([name])
+    if not typecheckers:
+        raise ValueError(
+            f"unknown typechecker {name}, expected one of "
+            + ", ".join(available())
+        )
+
+    settings: dict[str, str] = {}
+    for option in filter(None, options.split(",")):
+        setting, separator, value = option.partition("=")
+        if not separator or not value:
+            raise ValueError(f"expected SETTING=VALUE, got {option}")
+        settings[setting.replace("-", "_")] = value
+    return typecheckers[0].configure(**settings)
+
+
+def differences(results: list[Result]) -> str:
+    """Summary of the expectations which are met in some of the matrix cells,
+    but not in others"""
+    by_path: dict[Path, list[Result]] = defaultdict(list)
+    for result in results:
+        if result.skipped is None and result.aborted is None:
+            by_path[result.path].append(result)
+
+    lines = []
+    for path, cells in by_path.items():
+        failing = {
+            result.typechecker: {error.linenumber for error in result.errors}
+            for result in cells
+        }
+        for linenumber in sorted(set().union(*failing.values())):
+            failed = [cell for cell in failing if linenumber in failing[cell]]
+            if len(failed) == len(cells):
+                continue
+            passed = [cell for cell in failing if cell not in failed]
+            lines.append(
+                f"{path}:{linenumber} passes with {', '.join(passed)}; "
+                f"fails with {', '.join(failed)}"
+            )
+
+    if not lines:
+        return "No differences between matrix cells\n"
+    return "Differences between matrix cells\n" + "\n".join(lines) + "\n"
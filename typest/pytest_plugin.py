@@ -0,0 +1,152 @@
+"""pytest plugin collecting type test files as items, one per file and
+typechecker. Enable it with `pytest --typest`.
+
+Items are grouped into batches per typechecker, each batch being checked by a
+single invocation of the typechecker when its first item runs. With
+pytest-xdist, each batch is marked as an `xdist_group`, so that it is run by a
+single worker when distributing with `--dist loadgroup`."""
+from pathlib import Path
+from typing import Any, Iterator, Type
+
+import pytest
+
+from typest.cache import Cache
+from typest.error import Error
+from typest.session_cache import SessionCache
+from typest.typecheckers import select, TypeChecker
+from typest.utils.scanner import scan, UnsupportedFile
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("typest")
+    group.addoption(
+        "--typest",
+        action="store_true",
+        help="collect files with type expectations as type tests",
+    )
+    group.addoption(
+        "--typest-typecheckers",
+        default=None,
+        help="comma separated names of the typecheckers to run",
+    )
+    group.addoption(
+        "--typest-batch-size",
+        type=int,
+        default=50,
+        help="number of files checked by a single typechecker invocation",
+    )
+    group.addoption(
+        "--typest-no-cache",
+        action="store_true",
+        help="always invoke the typecheckers, ignoring cached outcomes",
+    )
+
+
+class TypestFailure(Exception):
+    def __init__(self, errors: list[Error]) -> None:
+        super().__init__(errors)
+        self.errors = errors
+
+
+class _Batches:
+    """Batches of items per typechecker, and the typecheckers' outcomes per
+    batch once it has been run"""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._paths: dict[str, list[Path]] = {}
+        self._checkers: dict[str, dict[Path, TypeChecker]] = {}
+
+    def assign(self, items: list["TypestItem"]) -> None:
+        counts: dict[str, int] = {}
+        for item in items:
+            name = item.typechecker.name
+            index = counts.get(name, 0)
+            counts[name] = index + 1
+            item.batch = f"typest-{name}-{index // self.size}"
+            self._paths.setdefault(item.batch, []).append(item.path)
+
+    def checker(self, item: "TypestItem") -> TypeChecker:
+        if item.batch not in self._checkers:
+            paths = self._paths[item.batch]
+            self._checkers[item.batch] = {
+                checker.path: checker
+                for checker in item.typechecker.batch(paths)
+            }
+        return self._checkers[item.batch][item.path]
+
+
+_batches_key = pytest.StashKey[_Batches]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if not config.getoption("typest"):
+        return
+    config.stash[_batches_key] = _Batches(config.getoption("typest_batch_size"))
+    if not config.getoption("typest_no_cache"):
+        TypeChecker.cache = Cache(config.rootpath / ".typest_cache")
+    TypeChecker.session_cache = SessionCache(
+        config.rootpath / ".typest_cache" / "session"
+    )
+
+
+def pytest_collect_file(
+    file_path: Path, parent: pytest.Collector
+) -> "TypestFile | None":
+    if not parent.config.getoption("typest") or file_path.suffix != ".py":
+        return None
+    try:
+        if not scan(file_path):
+            return None
+    except UnsupportedFile:
+        return None
+    return TypestFile.from_parent(parent, path=file_path)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(
+    session: pytest.Session, config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    if not config.getoption("typest"):
+        return
+    typest_items = [item for item in items if isinstance(item, TypestItem)]
+    config.stash[_batches_key].assign(typest_items)
+    # Before xdist's own hook, which groups the items by their markers
+    if config.pluginmanager.hasplugin("xdist"):
+        for item in typest_items:
+            item.add_marker(pytest.mark.xdist_group(item.batch))
+
+
+class TypestFile(pytest.File):
+    def collect(self) -> Iterator["TypestItem"]:
+        names = self.config.getoption("typest_typecheckers")
+        for typechecker in select(
+            names.split(",") if names is not None else None
+        ):
+            yield TypestItem.from_parent(
+                self, name=typechecker.name, typechecker=typechecker
+            )
+
+
+class TypestItem(pytest.Item):
+    def __init__(
+        self, *, typechecker: Type[TypeChecker], **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self.typechecker = typechecker
+        self.batch = ""
+
+    def runtest(self) -> None:
+        errors = self.config.stash[_batches_key].checker(self).run()
+        if errors:
+            raise TypestFailure(errors)
+
+    def repr_failure(self, excinfo: pytest.ExceptionInfo[BaseException]) -> str:
+        if isinstance(excinfo.value, TypestFailure):
+            return "\n".join(
+                error.format(colored=False) for error in excinfo.value.errors
+            )
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self) -> tuple[Path, None, str]:
+        return self.path, None, f"{self.path.name}::{self.typechecker.name}"
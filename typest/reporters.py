@@ -0,0 +1,158 @@
+import json
+import sys
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TextIO, Type
+
+from typest.result import Result
+from typest.utils.color import Color
+
+
+class Reporter(ABC):
+    """Writes results to a stream in one format. With `quiet`, only results
+    with errors are written."""
+
+    name: str
+
+    def __init__(
+        self, stream: TextIO, quiet: bool = False, owned: bool = False
+    ) -> None:
+        self.stream = stream
+        self.quiet = quiet
+        # Whether the stream was opened for the reporter, to be closed with it
+        self.owned = owned
+
+    def report(self, result: Result) -> None:
+        if self.quiet and result.flawless:
+            return
+        self._write(result)
+
+    @abstractmethod
+    def _write(self, result: Result) -> None:
+        """Write one result, with a single write to the stream"""
+
+    def close(self) -> None:
+        if self.owned:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+class TerminalReporter(Reporter):
+    """Colored, human readable output"""
+
+    name = "terminal"
+
+    def _write(self, result: Result) -> None:
+        path = result.path
+        out = f"Running tests against {result.typechecker}\n"
+
+        if result.skipped is not None:
+            out += Color.WARN.value + f"{path} " + Color.RESET.value
+            self.stream.write(out + f"{result.skipped}\n\n\n")
+            return
+        if result.aborted is not None:
+            out += Color.ALERT.value + f"{path} " + Color.RESET.value
+            self.stream.write(out + f"aborted: {result.aborted}\n\n\n")
+            return
+
+        progress = "".join(
+            (Color.OK.value if mark == "." else Color.ALERT.value)
+            + mark
+            + Color.RESET.value
+            for mark in result.progress
+        )
+        out += f"{path} {progress}\r"
+        if result.errors:
+            out += f"{Color.ALERT.value}{path} {Color.RESET.value}\n"
+            out += "".join(f"{error}\n" for error in result.errors)
+        else:
+            out += f"{Color.OK.value}{path} {Color.RESET.value}\n"
+        self.stream.write(out + "\n\n")
+
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per result and line, written as soon as the result is
+    known"""
+
+    name = "jsonl"
+
+    def _write(self, result: Result) -> None:
+        self.stream.write(json.dumps(result.to_dict()) + "\n")
+
+
+class JUnitReporter(Reporter):
+    """JUnit XML, with one test case per test file and typechecker. The
+    document is written once all results are known."""
+
+    name = "junit"
+
+    def __init__(
+        self, stream: TextIO, quiet: bool = False, owned: bool = False
+    ) -> None:
+        super().__init__(stream, quiet, owned)
+        self.results: list[Result] = []
+
+    def _write(self, result: Result) -> None:
+        self.results.append(result)
+
+    def close(self) -> None:
+        suite = ET.Element(
+            "testsuite",
+            name="typest",
+            tests=str(len(self.results)),
+            failures=str(sum(bool(result.errors) for result in self.results)),
+            skipped=str(
+                sum(result.skipped is not None for result in self.results)
+            ),
+            errors=str(
+                sum(result.aborted is not None for result in self.results)
+            ),
+            time=f"{sum(result.duration or 0 for result in self.results):.3f}",
+        )
+        for result in self.results:
+            case = ET.SubElement(
+                suite,
+                "testcase",
+                classname=result.typechecker,
+                name=result.path.as_posix(),
+                time=f"{result.duration or 0:.3f}",
+            )
+            if result.skipped is not None:
+                ET.SubElement(case, "skipped", message=result.skipped)
+            elif result.aborted is not None:
+                ET.SubElement(case, "error", message=result.aborted)
+            elif result.errors:
+                failure = ET.SubElement(
+                    case,
+                    "failure",
+                    message=f"{len(result.errors)} expectation(s) not met",
+                )
+                failure.text = "\n".join(
+                    error.format(colored=False) for error in result.errors
+                )
+
+        ET.indent(suite)
+        self.stream.write(
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            + ET.tostring(suite, encoding="unicode")
+            + "\n"
+        )
+        super().close()
+
+
+REPORTERS: dict[str, Type[Reporter]] = {
+    reporter.name: reporter
+    for reporter in (TerminalReporter, JsonLinesReporter, JUnitReporter)
+}
+
+
+def open_reporter(
+    format: str, output: Path | None = None, quiet: bool = False
+) -> Reporter:
+    """Reporter of the format named `format`, writing to the file `output`, or
+    to stdout if it is None"""
+    if output is None:
+        return REPORTERS[format](sys.stdout, quiet)
+    return REPORTERS[format](output.open("w"), quiet, owned=True)
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from typest.error import Error, RecordedError
+
+
+class Result:
+    """Wrapper class for holding the result of running one typechecker on one
+    test file"""
+
+    def __init__(
+        self,
+        path: Path,
+        typechecker: str,
+        errors: list[Error | RecordedError],
+        progress: str = "",
+        skipped: str | None = None,
+        duration: float | None = None,
+        aborted: str | None = None,
+    ) -> None:
+        self.path = path
+        self.typechecker = typechecker
+        self.errors = errors
+        self.progress = progress
+        self.skipped = skipped
+        self.duration = duration
+        # Reason why the typechecker was aborted, if it was
+        self.aborted = aborted
+
+    @property
+    def flawless(self) -> bool:
+        return not self.errors and self.aborted is None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path.as_posix(),
+            "typechecker": self.typechecker,
+            "errors": [
+                {
+                    "linenumber": error.linenumber,
+                    "message": error.format(colored=False),
+                }
+                for error in self.errors
+            ],
+            "progress": self.progress,
+            "skipped": self.skipped,
+            "duration": self.duration,
+            "aborted": self.aborted,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Result":
+        path = Path(data["path"])
+        return cls(
+            path,
+            data["typechecker"],
+            [
+                RecordedError(path, error["linenumber"], error["message"])
+                for error in data["errors"]
+            ],
+            data["progress"],
+            data["skipped"],
+            data["duration"],
+            data.get("aborted"),
+        )
+
+    def __repr__(self) -> str:
+        return f"Result({self.path}, {self.typechecker}, {self.errors})"
+
+
+def write_results(path: Path, results: list[Result]) -> None:
+    path.write_text(json.dumps([result.to_dict() for result in results]))
+
+
+def read_results(path: Path) -> list[Result]:
+    return [Result.from_dict(data) for data in json.loads(path.read_text())]
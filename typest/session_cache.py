@@ -0,0 +1,74 @@
+import atexit
+import hashlib
+import shutil
+import tempfile
+from contextlib import contextmanager
+from itertools import count
+from pathlib import Path
+from threading import Lock
+from typing import IO, Iterator
+
+from typest.utils.posix import fcntl
+
+
+class SessionCache:
+    """Directories in which typecheckers keep caches of their own, such as
+    mypy's analysis of imported libraries, across the runs of a session.
+
+    A typechecker's cache must not be written by two runs at once, so each
+    directory is handed out to one run at a time, also across processes.
+    Parallel runs get directories of their own, so that dependencies are
+    analysed once per worker rather than once per file.
+
+    Without `directory`, the caches are kept in a temporary directory which is
+    removed at exit."""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        if directory is None:
+            directory = Path(tempfile.mkdtemp(prefix="typest-session-"))
+            atexit.register(shutil.rmtree, directory, ignore_errors=True)
+        self.directory = directory
+        # Directories in use by runs of this process
+        self._held: set[Path] = set()
+        self._lock = Lock()
+
+    def _root(self, name: str) -> Path:
+        # Names of matrix cells may contain paths, so they are hashed
+        digest = hashlib.sha256(name.encode("utf-8")).hexdigest()[:12]
+        return self.directory / f"{name.split('[')[0]}-{digest}"
+
+    @contextmanager
+    def slot(self, name: str) -> Iterator[Path]:
+        """Directory for a run of the typechecker called `name`, which is
+        exclusively used by that run until the context is left"""
+        root = self._root(name)
+        for index in count():
+            directory = root / str(index)
+            with self._lock:
+                if directory in self._held:
+                    continue
+                directory.mkdir(parents=True, exist_ok=True)
+                lock = (directory / ".lock").open("ab")
+                if not _try_lock(lock):
+                    lock.close()
+                    continue
+                self._held.add(directory)
+            try:
+                yield directory
+            finally:
+                # Closing the file releases its lock
+                lock.close()
+                with self._lock:
+                    self._held.discard(directory)
+            return
+
+
+def _try_lock(file: IO[bytes]) -> bool:
+    """Lock the file against other processes, False if it is locked already"""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
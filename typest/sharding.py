@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+from typest.result import Result
+from typest.utils.files import relative
+from typest.utils.scanner import scan, UnsupportedFile
+
+
+def _key(path: Path) -> str:
+    # Relative paths, so that durations recorded on one machine apply on others
+    return relative(path).as_posix()
+
+
+def load_durations(path: Path) -> dict[str, float]:
+    """Durations per test file recorded by earlier runs, empty if there are
+    none"""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def store_durations(path: Path, results: list[Result]) -> None:
+    """Update the recorded durations with the ones of the results, summed over
+    the typecheckers. Files of which any outcomes were cached or checked in a
+    batch keep their previous durations, as a partial sum would understate
+    them."""
+    measured: dict[str, float | None] = {}
+    for result in results:
+        key = _key(result.path)
+        duration = measured.get(key, 0.0)
+        if duration is None or result.duration is None:
+            measured[key] = None
+        else:
+            measured[key] = duration + result.duration
+    durations = load_durations(path)
+    durations.update(
+        (key, duration)
+        for key, duration in measured.items()
+        if duration is not None
+    )
+    path.write_text(json.dumps(durations, indent=2, sort_keys=True))
+
+
+def _expectation_count(path: Path) -> int:
+    try:
+        return len(scan(path))
+    except (UnsupportedFile, OSError):
+        return 0
+
+
+def shard(
+    files: list[Path], index: int, count: int, durations: dict[str, float]
+) -> list[Path]:
+    """Files of shard `index` out of `count` (counting from 1). Files are
+    distributed greedily, longest first, to the shard with the least load,
+    which gives the same shards for the same files and durations on any
+    machine.
+
+    Files are weighted by their recorded durations. Files without a recorded
+    duration are assumed to take the mean of the recorded ones, or, if there
+    are no recorded durations at all, are weighted by their number of
+    expectations."""
+    known = [durations[_key(file)] for file in files if _key(file) in durations]
+    default = sum(known) / len(known) if known else None
+
+    def weight(file: Path) -> float:
+        if _key(file) in durations:
+            return durations[_key(file)]
+        if default is not None:
+            return default
+        return _expectation_count(file)
+
+    weighted = sorted(
+        ((weight(file), _key(file), file) for file in files),
+        key=lambda entry: (-entry[0], entry[1]),
+    )
+    loads = [0.0] * count
+    shards: list[list[Path]] = [[] for _ in range(count)]
+    for file_weight, _, file in weighted:
+        target = min(range(count), key=lambda i: (loads[i], i))
+        loads[target] += file_weight
+        shards[target].append(file)
+
+    return sorted(shards[index - 1], key=_key)
@@ -0,0 +1,287 @@
+import ast
+import copy
+import hashlib
+import os
+import re
+import textwrap
+from pathlib import Path
+from typing import NamedTuple, Type
+
+from typest.outcomes import Outcome
+from typest.result import Result
+from typest.typecheckers.base import TypeChecker
+from typest.utils.fake_type import FakeBuiltin, FakeGeneric, FakeType, FakeUnion
+from typest.utils.imports import module_name
+
+# Suffixes of documents whose code blocks are extracted
+DOCUMENT_SUFFIXES = (".md", ".rst")
+
+_LANGUAGES = ("python", "py", "python3", "pycon")
+
+_FENCE = re.compile(r"\s*(?P<fence>`{3,}|~{3,})\s*(?P<info>[^\s`]*)")
+
+_DIRECTIVE = re.compile(
+    r"(?P<indent>\s*)\.\. (code-block|code|sourcecode)::\s*(?P<language>\w*)"
+)
+
+_Lines = list[tuple[int, str]]
+
+
+class Snippet(NamedTuple):
+    """Lines of code from a document, along with their linenumbers in it"""
+
+    path: Path
+    lines: tuple[tuple[int, str], ...]
+
+
+def _doctest(lines: _Lines) -> _Lines:
+    """The code of doctest examples, without prompts and output"""
+    code = []
+    for linenumber, line in lines:
+        stripped = line.strip()
+        if stripped.startswith((">>> ", "... ")) or stripped in (">>>", "..."):
+            code.append((linenumber, line.lstrip()[4:]))
+    return code
+
+
+def _markdown_blocks(text: str) -> list[_Lines]:
+    blocks = []
+    # Closing fence and lines of the current code block. Lines of blocks in
+    # other languages are not collected.
+    fence: str | None = None
+    block: _Lines | None = None
+    for linenumber, line in enumerate(text.splitlines(), start=1):
+        if fence is None:
+            match = _FENCE.match(line)
+            if match is not None:
+                fence = match.group("fence")
+                language = match.group("info").lower()
+                block = [] if language in _LANGUAGES else None
+        elif line.strip().startswith(fence) and not line.strip(fence[0] + " "):
+            if block is not None:
+                blocks.append(block)
+            fence = None
+        elif block is not None:
+            block.append((linenumber, line))
+    return blocks
+
+
+def _rst_blocks(text: str) -> list[_Lines]:
+    lines = text.splitlines()
+    blocks = []
+    for index, line in enumerate(lines):
+        match = _DIRECTIVE.match(line)
+        if match is None or match.group("language").lower() not in _LANGUAGES:
+            continue
+        indent = len(match.group("indent"))
+        block = []
+        for linenumber, code in enumerate(lines[index + 1 :], start=index + 2):
+            if code.strip() and len(code) - len(code.lstrip()) <= indent:
+                break
+            block.append((linenumber, code))
+        # Options of the directive, e.g. `:caption:`, precede the code
+        while block and block[0][1].strip().startswith(":"):
+            block.pop(0)
+        blocks.append(block)
+    return blocks
+
+
+def _docstring_blocks(text: str) -> list[_Lines]:
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return []
+    blocks = []
+    for node in ast.walk(tree):
+        if not isinstance(
+            node,
+            (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef),
+        ):
+            continue
+        if not node.body or not isinstance(node.body[0], ast.Expr):
+            continue
+        docstring = node.body[0].value
+        if isinstance(docstring, ast.Constant) and isinstance(
+            docstring.value, str
+        ):
+            lines = docstring.value.splitlines()
+            blocks.append(
+                _doctest(list(enumerate(lines, start=docstring.lineno)))
+            )
+    return blocks
+
+
+def extract(path: Path) -> list[Snippet]:
+    """Snippets of python code with expectations in a document: the python
+    code blocks of Markdown and reStructuredText documents, and the doctest
+    examples in the docstrings of python files"""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    if path.suffix == ".md":
+        blocks = _markdown_blocks(text)
+    elif path.suffix == ".rst":
+        blocks = _rst_blocks(text)
+    elif path.suffix == ".py":
+        blocks = _docstring_blocks(text)
+    else:
+        return []
+
+    snippets = []
+    for lines in blocks:
+        if any(line.lstrip().startswith(">>>") for _, line in lines):
+            lines = _doctest(lines)
+        if not any("expect-" in line for _, line in lines):
+            continue
+        code = textwrap.dedent("\n".join(line for _, line in lines))
+        snippets.append(
+            Snippet(
+                path,
+                tuple(
+                    (linenumber, line)
+                    for (linenumber, _), line in zip(lines, code.split("\n"))
+                ),
+            )
+        )
+    return snippets
+
+
+def _as_written(typ: FakeType, module: str) -> FakeType:
+    """The type with the classes defined in snippets named as in the snippets,
+    e.g. `Foo` rather than `snippets_0.Foo@2`, the name mypy gives to classes
+    local to the functions of the generated module"""
+    if isinstance(typ, str):
+        return re.sub(rf"(?<![\w.]){module}\.(\w+)@\d+", r"\1", typ)
+    if isinstance(typ, FakeGeneric):
+        return FakeGeneric(
+            _as_written(typ._name, module),
+            *(_as_written(inner, module) for inner in typ._types),
+        )
+    if isinstance(typ, FakeUnion):
+        return FakeUnion(*(_as_written(inner, module) for inner in typ._types))
+    return typ
+
+
+def _outcomes_as_written(
+    outcomes: dict[int, list[Outcome]], module: str
+) -> dict[int, list[Outcome]]:
+    translated: dict[int, list[Outcome]] = {}
+    for linenumber, line_outcomes in outcomes.items():
+        for outcome in line_outcomes:
+            # The outcomes of the typechecker are left as they were reported
+            outcome = copy.copy(outcome)
+            for name, value in list(vars(outcome).items()):
+                if isinstance(
+                    value, (str, FakeBuiltin, FakeGeneric, FakeUnion)
+                ):
+                    setattr(outcome, name, _as_written(value, module))
+            translated.setdefault(linenumber, []).append(outcome)
+    return translated
+
+
+def modules_directory() -> Path:
+    """Directory where the snippets of the documents under the working
+    directory are packed into modules. It is the same on every run, so that
+    the outcomes of unchanged snippets are found in the cache. It is outside of
+    the working directory, as pyright skips files in hidden directories such as
+    `.typest_cache`, and test discovery would pick up the modules."""
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    project = hashlib.sha256(str(Path.cwd()).encode("utf-8")).hexdigest()
+    return Path(cache) / "typest" / "snippets" / project[:16]
+
+
+class Pack:
+    """Snippets of several documents, packed into a few modules generated in a
+    directory, so that each typechecker is invoked only once for all of them.
+    Each snippet is wrapped into a function of its own, isolating its names
+    from the other snippets. Snippets which are not valid python are left
+    out."""
+
+    def __init__(
+        self,
+        snippets: dict[Path, list[Snippet]],
+        directory: Path,
+        size: int = 100,
+    ) -> None:
+        self.modules: list[Path] = []
+        # Per module, its documents along with the range of their lines
+        self._documents: dict[Path, list[tuple[Path, range]]] = {}
+        # Per module and linenumber, the linenumber in the document
+        self._origins: dict[Path, dict[int, int]] = {}
+
+        contents: dict[Path, list[str]] = {}
+        count = 0
+        for document, document_snippets in snippets.items():
+            if not self.modules or count >= size:
+                module = directory / f"snippets_{len(self.modules)}.py"
+                self.modules.append(module)
+                self._documents[module] = []
+                self._origins[module] = {}
+                contents[module] = []
+                count = 0
+            lines = contents[module]
+            start = len(lines) + 1
+            if document.suffix == ".py" and document_snippets:
+                # Examples in docstrings use the names of their module
+                lines.append(f"from {module_name(document)} import *")
+                self._origins[module][len(lines)] = document_snippets[0].lines[
+                    0
+                ][0]
+            for snippet in document_snippets:
+                function = [f"def _snippet_{count}() -> None:"] + [
+                    f"    {line}" if line.strip() else ""
+                    for _, line in snippet.lines
+                ]
+                try:
+                    ast.parse("\n".join(function))
+                except SyntaxError:
+                    continue
+                origins = [snippet.lines[0][0]]
+                origins += [linenumber for linenumber, _ in snippet.lines]
+                for offset, origin in enumerate(origins):
+                    self._origins[module][len(lines) + 1 + offset] = origin
+                lines.extend(function)
+                count += 1
+            self._documents[module].append(
+                (document, range(start, len(lines) + 1))
+            )
+
+        for module, lines in contents.items():
+            module.write_text("".join(f"{line}\n" for line in lines))
+
+    def checkers(
+        self, typechecker: Type[TypeChecker]
+    ) -> list[tuple[Path, TypeChecker]]:
+        """An instance of the typechecker per document, checking the snippets
+        of the document, in order of the documents. The typechecker is invoked
+        only once for all modules."""
+        checkers = []
+        for batched in typechecker.batch(self.modules):
+            documents = self._documents[batched.path]
+            actual = batched._actual
+            if actual is not None:
+                actual = _outcomes_as_written(actual, batched.path.stem)
+            for document, lines in documents:
+                checker = typechecker(batched.path)
+                checker._expected = [
+                    outcome
+                    for outcome in batched._expected_outcomes()
+                    if outcome.linenumber in lines
+                ]
+                checker._actual = actual
+                checker.aborted = batched.aborted
+                if batched.duration is not None:
+                    checker.duration = batched.duration / len(documents)
+                checkers.append((document, checker))
+        return checkers
+
+    def translate(self, document: Path, result: Result) -> Result:
+        """The result of checking a module, in terms of the document"""
+        origins = self._origins.get(result.path, {})
+        for error in result.errors:
+            error.path = document
+            error.linenumber = origins.get(error.linenumber, error.linenumber)
+        result.path = document
+        return result
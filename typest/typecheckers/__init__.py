@@ -1,3 +1,63 @@
+from functools import cache
+from importlib import import_module
+
 from .base import TypeChecker
-from .mypy import Mypy
-from .pyright import Pyright
+
+# Built-in typecheckers by name, as `module:class`. Modules are only imported
+# once their typechecker is selected.
+_BUILTIN = {
+    "mypy": "typest.typecheckers.mypy:Mypy",
+    "dmypy": "typest.typecheckers.dmypy:Dmypy",
+    "mypy-api": "typest.typecheckers.mypy_api:MypyApi",
+    "pyright": "typest.typecheckers.pyright:Pyright",
+    "pyright-langserver": "typest.typecheckers.pyright_langserver:PyrightLangserver",
+}
+
+# Typecheckers selected by default. Alternative backends of a typechecker, and
+# typecheckers of other packages, are only selected by name.
+_DEFAULT = ["mypy", "pyright"]
+
+# Entry point group, under which other packages register typecheckers by name
+ENTRY_POINT_GROUP = "typest.typecheckers"
+
+
+@cache
+def _entry_points() -> dict[str, str]:
+    # Looking up entry points is slow, so it is only done when needed
+    from importlib.metadata import entry_points
+
+    return {
+        entry_point.name: entry_point.value
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP)
+    }
+
+
+def available() -> list[str]:
+    """Names of all available typecheckers"""
+    return [*_BUILTIN, *(n for n in _entry_points() if n not in _BUILTIN)]
+
+
+@cache
+def load(name: str) -> type[TypeChecker]:
+    """Typechecker of the given name, importing its module. Raises KeyError
+    for unknown names."""
+    spec = _BUILTIN[name] if name in _BUILTIN else _entry_points()[name]
+    module, _, attribute = spec.partition(":")
+    return getattr(import_module(module), attribute)
+
+
+def select(names: list[str] | None = None) -> list[type[TypeChecker]]:
+    """Typecheckers of the given names, by default mypy and pyright. Unknown
+    names are ignored."""
+    if names is None:
+        return [load(name) for name in _DEFAULT]
+    known = _BUILTIN if set(names) <= _BUILTIN.keys() else available()
+    return [load(name) for name in known if name in names]
+
+
+def __getattr__(attribute: str) -> type[TypeChecker]:
+    # Built-in typecheckers can still be imported from here by class name
+    for name, spec in _BUILTIN.items():
+        if spec.endswith(f":{attribute}"):
+            return load(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {attribute!r}")
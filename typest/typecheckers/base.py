@@ -1,109 +1,434 @@
-from abc import abstractmethod, ABC, abstractstaticmethod
+import os
+import re
+import time
+from abc import ABC, abstractmethod
 from pathlib import Path
-
-from subprocess import Popen, PIPE
-
-from comment_parser import comment_parser
+from contextlib import contextmanager, nullcontext
+from typing import (
+    ContextManager,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Type,
+    TYPE_CHECKING,
+)
 
 from typest.error import Error
-from typest.outcomes import Flaw, Outcome, RevealedType
-from typest.outcomes.mismatch import Mismatch
-from typest.utils.color import Color
-from typest.utils.fake_type import FakeType
+from typest.outcomes import Outcome
+from typest.utils.fake_type import parse
+from typest.utils.process import Aborted, supervised
+from typest.utils.scanner import scan, UnsupportedFile
+from typest.utils.timing import Span, Timings
+
+if TYPE_CHECKING:
+    from typest.cache import Cache
+    from typest.session_cache import SessionCache
 
 
 class NoTestFound(Exception):
     pass
 
 
+class BatchFailed(Exception):
+    """The typechecker stopped before checking all files of a batch, e.g.
+    because of a file blocking the others"""
+
+
+class Diagnostic(NamedTuple):
+    """A message of the typechecker concerning a certain line of a file"""
+
+    path: str
+    linenumber: int
+    severity: str
+    message: str
+
+
 class TypeChecker(ABC):
     """Base class for running a typechecker and interpreting its output"""
 
     name: str
 
+    # Anchored pattern matching those lines of the typechecker's output which
+    # concern a certain line of a checked file. Named groups: `path`,
+    # `linenumber`, `severity` and `message`. Typecheckers with structured
+    # output override `_diagnostics` instead.
+    line_pattern: re.Pattern[str]
+
+    # Per severity, anchored patterns classifying the message of a diagnostic
+    # as an outcome. Each matching pattern yields an outcome, which is built
+    # from the linenumber and the named groups of the match, parsed as types.
+    message_patterns: dict[str, list[tuple[re.Pattern[str], Type[Outcome]]]]
+
+    # Exit statuses of the typechecker telling that it stopped before checking
+    # all files. Files of a batch which ends with one are checked one by one.
+    blocking_returncodes: frozenset[int] = frozenset()
+
+    # Files in the working directory which configure the typechecker
+    config_files: list[str] = ["pyproject.toml"]
+
+    # Cache of actual outcomes, shared by all typecheckers. Disabled if None.
+    cache: "Cache | None" = None
+
+    # Directories for the typecheckers' own caches, kept across the runs of a
+    # session. Disabled if None.
+    session_cache: "SessionCache | None" = None
+
+    # Options making the typechecker keep its own cache in a directory, which
+    # is substituted for `{directory}`. Empty if it keeps no cache on disk.
+    cache_options: list[str] = []
+
+    # Limits of each run of the typechecker's process: seconds of wall time,
+    # bytes of address space and seconds of CPU time. Unlimited if None.
+    timeout: float | None = None
+    memory_limit: int | None = None
+    cpu_limit: int | None = None
+
+    # Recorder of the durations of the stages of runs. Disabled if None.
+    timings: Timings | None = None
+
+    # Executable invoked by the typechecker, which matrix cells may replace.
+    # None if the backend cannot run another executable.
+    executable: str | None = None
+
+    # Command line flags of the typechecker for the settings of matrix cells,
+    # `python_version` and `config_file`, and the values of a matrix cell
+    matrix_flags: dict[str, str] = {}
+    matrix_settings: dict[str, str] = {}
+
     def __init__(self, path: Path) -> None:
         self.path = path
+        self._expected: list[Outcome] | None = None
+        self._actual: dict[int, list[Outcome]] | None = None
+        self.progress = ""
+        # Seconds spent on obtaining the actual outcomes, None if cached or
+        # obtained along with the outcomes of other files
+        self.duration: float | None = None
+        # Reason why the run was aborted, if it was
+        self.aborted: str | None = None
 
+    @classmethod
+    def batch(cls, paths: list[Path]) -> list["TypeChecker"]:
+        """Instantiate the typechecker for each of the paths, invoking it only
+        once for all files containing tests"""
+        checkers = {checker.path: checker for checker in cls.iter_batch(paths)}
+        return [checkers[path] for path in paths]
+
+    @classmethod
+    def iter_batch(cls, paths: list[Path]) -> Iterator["TypeChecker"]:
+        """Like batch, but yields each instance as soon as the outcomes of its
+        file are known. Instances for files without tests come first."""
+        checkers = {path: cls(path) for path in paths}
+        testable: list[Path] = []
+        for path, checker in checkers.items():
+            try:
+                has_tests = bool(checker._expected_outcomes())
+            except UnsupportedFile:
+                has_tests = False
+            if has_tests:
+                testable.append(path)
+            else:
+                yield checker
+
+        if testable:
+            try:
+                for path, outcomes, duration in cls._cached_outcomes(testable):
+                    checkers[path]._actual = outcomes
+                    checkers[path].duration = duration
+                    yield checkers[path]
+            except Aborted as error:
+                # Files whose outcomes were complete before are not affected
+                for path in testable:
+                    if checkers[path]._actual is None:
+                        checkers[path].aborted = str(error)
+                        yield checkers[path]
+            except BatchFailed:
+                # The remaining files are checked on their own once they run
+                for path in testable:
+                    if checkers[path]._actual is None:
+                        yield checkers[path]
+
+    @classmethod
     @abstractmethod
+    def batch_command(cls, paths: list[Path]) -> list[str]:
+        """Command to invoke the typechecker on several files at once"""
+        pass
+
     def command(self) -> list[str]:
         """Command to invoke the typechecker on a certain file"""
-        pass
+        return self.batch_command([self.path])
 
-    @abstractstaticmethod
-    def _extract_linenumber(line: str) -> int | None:
-        """Extract linenumber from line of typechecker's output"""
-        pass
+    @classmethod
+    def version_command(cls) -> list[str]:
+        """Command to print the version of the typechecker"""
+        return [cls.batch_command([])[0], "--version"]
 
-    @abstractstaticmethod
-    def _extract_type(line: str, linenumber: int) -> RevealedType | None:
-        """Extract revealed type from line of typechecker's output"""
-        pass
+    @classmethod
+    def installed_version(cls) -> str | None:
+        """Version of the typechecker if it can be told without running it,
+        None otherwise"""
+        return None
 
-    @abstractstaticmethod
-    def _extract_flaw(line: str, linenumber: int) -> Flaw | None:
-        """Extract unspecific error from line of typechecker's output"""
-        pass
+    @classmethod
+    def configure(cls, **settings: str) -> Type["TypeChecker"]:
+        """Matrix cell of the typechecker: a subclass running with the given
+        `executable`, `python_version` or `config_file`, named after them, e.g.
+        `mypy[python-version=3.8]`. Raises ValueError for settings the backend
+        does not support."""
+        unsupported = [
+            setting
+            for setting in settings
+            if setting not in cls.matrix_flags
+            and not (setting == "executable" and cls.executable is not None)
+        ]
+        if unsupported:
+            raise ValueError(
+                f"{cls.name} cannot be configured with {', '.join(unsupported)}"
+            )
+        if not settings:
+            return cls
 
-    @abstractstaticmethod
-    def _extract_mismatch(line: str, linenumber: int) -> Mismatch | None:
-        """Extract type mismatch error from line of typechecker's output"""
-        pass
+        label = ",".join(
+            f"{setting.replace('_', '-')}={value}"
+            for setting, value in settings.items()
+        )
+        attributes: dict[str, object] = {
+            "name": f"{cls.name}[{label}]",
+            "executable": settings.pop("executable", cls.executable),
+            "matrix_settings": {**cls.matrix_settings, **settings},
+        }
+        if "config_file" in settings:
+            # Cached outcomes depend on the configuration file as well
+            attributes["config_files"] = [
+                *cls.config_files,
+                settings["config_file"],
+            ]
+        return type(cls.__name__, (cls,), attributes)
+
+    @classmethod
+    def _matrix_options(cls) -> list[str]:
+        return [
+            option
+            for setting, value in cls.matrix_settings.items()
+            for option in (cls.matrix_flags[setting], value)
+        ]
+
+    @classmethod
+    @contextmanager
+    def _command(cls, paths: list[Path]) -> Iterator[list[str]]:
+        """Command to invoke the typechecker on the paths, with a directory of
+        the session cache to itself for as long as the context lasts"""
+        command = cls.batch_command(paths)
+        if cls.session_cache is None or not cls.cache_options:
+            yield command
+            return
+        with cls.session_cache.slot(cls.name) as directory:
+            yield command + [
+                option.format(directory=directory)
+                for option in cls.cache_options
+            ]
+
+    @classmethod
+    def _measure(
+        cls, stage: str, paths: list[Path]
+    ) -> ContextManager[Span | None]:
+        if cls.timings is None:
+            return nullcontext()
+        label = str(paths[0]) if len(paths) == 1 else f"{len(paths)} files"
+        return cls.timings.measure(stage, cls.name, label)
 
     def _expected_outcomes(self) -> list[Outcome]:
-        expected: list[Outcome] = []
-        for comment in comment_parser.extract_comments(self.path):
-            text = comment.text()
-            linenumber = comment.line_number()
-            expectation = RevealedType.from_comment(
-                linenumber, text
-            ) or Flaw.from_comment(linenumber, text)
-            if expectation is not None:
-                expected.append(expectation)
-        return expected
-
-    def _actual_outcomes(self) -> list[Outcome]:
-        actual: list[Outcome] = []
-        process = Popen(self.command(), stdout=PIPE)
-        output, _ = process.communicate()
-        for line in output.decode("utf-8").split("\n"):
-            linenumber = self._extract_linenumber(line)
-            if linenumber is None:
+        if self._expected is None:
+            with self._measure("expectations", [self.path]):
+                self._expected = scan(self.path)
+        return self._expected
+
+    @classmethod
+    def _output(cls, paths: list[Path]) -> Iterator[bytes]:
+        """Run the typechecker once over all paths, yielding the lines of its
+        output as they are produced. Raises BatchFailed if the typechecker
+        stopped before checking all of several paths."""
+        with cls._command(paths) as command, cls._measure(
+            "subprocess", paths
+        ) as span:
+            with supervised(
+                command, cls.timeout, cls.memory_limit, cls.cpu_limit
+            ) as process:
+                assert process.stdout is not None
+                yield from process.stdout
+                if span is not None and hasattr(os, "wait4"):
+                    # Reap the process ourselves to learn about its resources
+                    _, status, usage = os.wait4(process.pid, 0)
+                    process.returncode = os.waitstatus_to_exitcode(status)
+                    span.cpu = usage.ru_utime + usage.ru_stime
+                    span.rss = usage.ru_maxrss * 1024
+            cls._check_returncode(paths, process.returncode)
+
+    @classmethod
+    def _check_returncode(cls, paths: list[Path], returncode: int) -> None:
+        if len(paths) > 1 and returncode in cls.blocking_returncodes:
+            raise BatchFailed(
+                f"{cls.name} exited with status {returncode} on {len(paths)} "
+                "files"
+            )
+
+    @classmethod
+    def _stream_outcomes(
+        cls, paths: list[Path]
+    ) -> Iterator[tuple[Path, dict[int, list[Outcome]]]]:
+        """Run the typechecker once over all paths, yielding the outcomes of
+        each file, indexed by linenumber, as soon as they are complete"""
+        return cls._route(paths, cls._diagnostics(cls._output(paths)))
+
+    @classmethod
+    def _cached_outcomes(
+        cls, paths: list[Path]
+    ) -> Iterator[tuple[Path, dict[int, list[Outcome]], float | None]]:
+        """Like _stream_outcomes, but the typechecker is only invoked on the
+        files whose outcomes are not cached. Cached outcomes come first.
+
+        Along with the outcomes of each file, the time spent on it is yielded.
+        It is None if the outcomes were cached, or if the typechecker was
+        invoked on several files at once, as its time cannot be told apart per
+        file."""
+        if cls.cache is None:
+            yield from cls._timed_outcomes(paths)
+            return
+
+        keys = {path: cls.cache.key(cls, path) for path in paths}
+        missing: list[Path] = []
+        for path, key in keys.items():
+            outcomes = cls.cache.get(key)
+            if outcomes is None:
+                missing.append(path)
+            else:
+                yield path, outcomes, None
+
+        if missing:
+            for path, outcomes, duration in cls._timed_outcomes(missing):
+                cls.cache.set(keys[path], outcomes)
+                yield path, outcomes, duration
+            cls.cache.evict()
+
+    @classmethod
+    def _timed_outcomes(
+        cls, paths: list[Path]
+    ) -> Iterator[tuple[Path, dict[int, list[Outcome]], float | None]]:
+        start = time.perf_counter()
+        for path, outcomes in cls._measured_outcomes(paths):
+            if len(paths) == 1:
+                yield path, outcomes, time.perf_counter() - start
+            else:
+                yield path, outcomes, None
+
+    @classmethod
+    def _measured_outcomes(
+        cls, paths: list[Path]
+    ) -> Iterator[tuple[Path, dict[int, list[Outcome]]]]:
+        """Like _stream_outcomes, measuring the parsing of the output. Parsing
+        is interleaved with waiting for the output, so its wall time includes
+        the typechecker's run, while its CPU time is the parsing's alone."""
+        with cls._measure("parsing", paths):
+            yield from cls._stream_outcomes(paths)
+
+    @classmethod
+    def _diagnostics(cls, lines: Iterable[bytes]) -> Iterator[Diagnostic]:
+        """Diagnostics reported in the lines of the typechecker's output, found
+        through `line_pattern`"""
+        for line in lines:
+            match = cls.line_pattern.match(line.decode("utf-8").rstrip("\r\n"))
+            if match is None:
                 continue
+            yield Diagnostic(
+                match.group("path"),
+                int(match.group("linenumber")),
+                match.group("severity"),
+                match.group("message"),
+            )
+
+    @classmethod
+    def _route(
+        cls, paths: list[Path], diagnostics: Iterable[Diagnostic]
+    ) -> Iterator[tuple[Path, dict[int, list[Outcome]]]]:
+        """Route the outcomes of the diagnostics into buckets per file, indexed
+        by linenumber. Diagnostics concerning other files are ignored.
 
-            flaw = self._extract_flaw(line, linenumber)
-            if flaw is not None:
-                actual.append(flaw)
+        Typecheckers report the diagnostics of a file together, so a bucket is
+        yielded as soon as the diagnostics move on to another of the files.
+        The remaining buckets are yielded at the end."""
+        resolved = {path.resolve(): path for path in paths}
+        targets: dict[str, Path | None] = {}
+        pending: dict[Path, dict[int, list[Outcome]]] = {
+            path: {} for path in paths
+        }
+        current: Path | None = None
+        for diagnostic in diagnostics:
+            # Diagnostics mostly concern few files, so resolve each only once
+            path = diagnostic.path
+            if path not in targets:
+                targets[path] = resolved.get(Path(path).resolve())
+            target = targets[path]
+            if target is None or target not in pending:
+                continue
+            if current is not None and target != current:
+                yield current, pending.pop(current)
+            current = target
 
-            mismatch = self._extract_mismatch(line, linenumber)
-            if mismatch is not None:
-                actual.append(mismatch)
+            linenumber = diagnostic.linenumber
+            for pattern, outcome_type in cls.message_patterns.get(
+                diagnostic.severity, []
+            ):
+                match = pattern.match(diagnostic.message)
+                if match is None:
+                    continue
+                types = {
+                    name: parse(value)
+                    for name, value in match.groupdict().items()
+                }
+                pending[target].setdefault(linenumber, []).append(
+                    outcome_type(linenumber, **types)
+                )
 
-            revealed_type = self._extract_type(line, linenumber)
-            if revealed_type is not None:
-                actual.append(revealed_type)
+        yield from pending.items()
 
-        return actual
+    def _actual_outcomes(self) -> dict[int, list[Outcome]]:
+        """Run the typechecker once and index its outcomes by linenumber"""
+        if self._actual is None:
+            for _, outcomes, duration in self._cached_outcomes([self.path]):
+                self._actual = outcomes
+                self.duration = duration
+        assert self._actual is not None
+        return self._actual
 
     def run(self) -> list[Error]:
-        """Raises NoTestFound if no tests are defined in this testfile"""
+        """Raises NoTestFound if no tests are defined in this testfile, Aborted
+        if the typechecker was killed. Progress of the matching is recorded in
+        `progress`, one character per comparison."""
         expected_outcomes = self._expected_outcomes()
         if not expected_outcomes:
             raise NoTestFound()
+        if self.aborted is not None:
+            raise Aborted(self.aborted)
 
-        print(self.path, end=" ")
+        actual_outcomes = self._actual_outcomes()
+        with self._measure("matching", [self.path]):
+            return self._match(expected_outcomes, actual_outcomes)
 
+    def _match(
+        self,
+        expected_outcomes: list[Outcome],
+        actual_outcomes: dict[int, list[Outcome]],
+    ) -> list[Error]:
+        self.progress = ""
         errors: list[Error] = []
         for expected in expected_outcomes:
             has_match = False
-            for actual in self._actual_outcomes():
-                if expected.linenumber != actual.linenumber:
-                    continue
+            for actual in actual_outcomes.get(expected.linenumber, []):
                 has_match = True
                 if expected == actual:
-                    print(Color.OK.value + "." + Color.RESET.value, end="")
+                    self.progress += "."
                     break
 
-                print(Color.ALERT.value + "F" + Color.RESET.value, end="")
+                self.progress += "F"
                 errors.append(
                     Error(
                         self.path,
@@ -115,5 +440,4 @@ class TypeChecker(ABC):
             else:
                 if not has_match:
                     errors.append(Error(self.path, expected, None))
-        print("", end="\r")
         return errors
@@ -0,0 +1,84 @@
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
+from subprocess import DEVNULL, run
+from threading import Lock
+from typing import Iterator
+
+from typest.outcomes import Outcome
+from typest.typecheckers.mypy import Mypy
+
+
+class Dmypy(Mypy):
+    """Runs mypy through a daemon which is started once per session and kept
+    warm across files. Output is the same as mypy's."""
+
+    name = "dmypy"
+
+    # The daemon is shared by all runs, so it cannot be set up per matrix cell
+    executable = None
+    matrix_flags = {}
+    # The daemon keeps its state in memory instead
+    cache_options = []
+
+    _lock = Lock()
+    _status_dir: Path | None = None
+
+    @classmethod
+    def _status_file(cls) -> Path:
+        if cls._status_dir is None:
+            cls._status_dir = Path(tempfile.mkdtemp(prefix="typest-dmypy-"))
+        return cls._status_dir / "status.json"
+
+    @classmethod
+    def _start(cls) -> None:
+        if cls._status_file().exists():
+            return
+        run(
+            ["dmypy", "--status-file", str(cls._status_file()), "start"],
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+            check=True,
+        )
+        atexit.register(cls._stop)
+
+    @classmethod
+    def _stop(cls) -> None:
+        if cls._status_dir is None:
+            return
+        run(
+            ["dmypy", "--status-file", str(cls._status_file()), "stop"],
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+        )
+        shutil.rmtree(cls._status_dir, ignore_errors=True)
+        cls._status_dir = None
+
+    @classmethod
+    def _json_output(cls) -> bool:
+        # The daemon's output format is fixed when it is started
+        return False
+
+    @classmethod
+    def version_command(cls) -> list[str]:
+        return ["dmypy", "--version"]
+
+    @classmethod
+    def batch_command(cls, paths: list[Path]) -> list[str]:
+        return [
+            "dmypy",
+            "--status-file",
+            str(cls._status_file()),
+            "check",
+            *(str(path) for path in paths),
+        ]
+
+    @classmethod
+    def _stream_outcomes(
+        cls, paths: list[Path]
+    ) -> Iterator[tuple[Path, dict[int, list[Outcome]]]]:
+        # The daemon serves one request at a time, parallel runs are queued
+        with cls._lock:
+            cls._start()
+            yield from super()._stream_outcomes(paths)
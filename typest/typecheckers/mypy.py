@@ -1,50 +1,103 @@
+import json
 import re
+from functools import cache
+from pathlib import Path
+from subprocess import DEVNULL, PIPE, run
+from typing import Iterable, Iterator
 
 from typest.outcomes import Flaw, RevealedType
 from typest.outcomes.mismatch import Mismatch
-from typest.typecheckers.base import TypeChecker
-from typest.utils.fake_type import parse
+from typest.typecheckers.base import Diagnostic, TypeChecker
+
+
+@cache
+def _supports_json_output(executable: str = "mypy") -> bool:
+    """Whether the installed mypy can report errors as JSON lines, which it can
+    from version 1.11 on"""
+    try:
+        output = run(
+            [executable, "--version"], stdout=PIPE, stderr=DEVNULL
+        ).stdout
+    except OSError:
+        return False
+    match = re.search(rb"(\d+)\.(\d+)", output)
+    if match is None:
+        return False
+    return (int(match.group(1)), int(match.group(2))) >= (1, 11)
 
 
 class Mypy(TypeChecker):
     """Parser for mypy output"""
 
     name = "mypy"
+    config_files = ["mypy.ini", ".mypy.ini", "pyproject.toml", "setup.cfg"]
+    executable = "mypy"
+    matrix_flags = {
+        "python_version": "--python-version",
+        "config_file": "--config-file",
+    }
+    cache_options = ["--cache-dir", "{directory}", "--sqlite-cache"]
+    # Blocking errors, such as syntax errors or duplicate module names, stop
+    # mypy from checking the other files
+    blocking_returncodes = frozenset([2])
+
+    line_pattern = re.compile(
+        r"(?P<path>.+?\.py):(?P<linenumber>\d+): (?P<severity>\w+): "
+        r"(?P<message>.*)"
+    )
+
+    message_patterns = {
+        "note": [
+            (re.compile(r'Revealed type is "(?P<typ>.*)"'), RevealedType),
+        ],
+        "error": [
+            (re.compile(r""), Flaw),
+            (
+                re.compile(
+                    r"Incompatible types in assignment \(expression has type "
+                    r'"(?P<assigned_type>.*)", variable has type '
+                    r'"(?P<actual_type>.*)"\)'
+                ),
+                Mismatch,
+            ),
+        ],
+    }
+
+    @classmethod
+    def batch_command(cls, paths: list[Path]) -> list[str]:
+        assert cls.executable is not None
+        options = ["--output", "json"] if cls._json_output() else []
+        return [
+            cls.executable,
+            *options,
+            *cls._matrix_options(),
+            *(str(path) for path in paths),
+        ]
+
+    @classmethod
+    def version_command(cls) -> list[str]:
+        assert cls.executable is not None
+        return [cls.executable, "--version"]
+
+    @classmethod
+    def _json_output(cls) -> bool:
+        assert cls.executable is not None
+        return _supports_json_output(cls.executable)
+
+    @classmethod
+    def _diagnostics(cls, lines: Iterable[bytes]) -> Iterator[Diagnostic]:
+        if not cls._json_output():
+            yield from super()._diagnostics(lines)
+            return
 
-    def command(self) -> list[str]:
-        return ["mypy", str(self.path)]
-
-    @staticmethod
-    def _extract_linenumber(line: str) -> int | None:
-        match = re.search(r".*\.py:(\d+):.*", line)
-        if match is None:
-            return None
-        return int(match.group(1))
-
-    @staticmethod
-    def _extract_type(line: str, linenumber: int) -> RevealedType | None:
-        match = re.search(r'.*\.py:\d+: note: Revealed type is "(.*)"', line)
-        if match is None:
-            return None
-        return RevealedType(linenumber, parse(match.group(1)))
-
-    @staticmethod
-    def _extract_flaw(line: str, linenumber: int) -> Flaw | None:
-        match = re.search(r".*\.py:\d+: error: (.*)", line)
-        if match is None:
-            return None
-        return Flaw(linenumber)
-
-    @staticmethod
-    def _extract_mismatch(line: str, linenumber: int) -> Mismatch | None:
-        pattern = (
-            r".* error: Incompatible types in assignment \(expression has type "
-            r'"(.*)", variable has type "(.*)"\)'
-        )
-        match = re.search(pattern, line)
-        if not match:
-            return None
-        assigned_type = match.group(1)
-        actual_type = match.group(2)
-
-        return Mismatch(linenumber, assigned_type, actual_type)
+        for line in lines:
+            try:
+                diagnostic = json.loads(line)
+            except ValueError:
+                continue
+            yield Diagnostic(
+                diagnostic["file"],
+                diagnostic["line"],
+                diagnostic["severity"],
+                diagnostic["message"],
+            )
@@ -0,0 +1,112 @@
+import sys
+from importlib.metadata import PackageNotFoundError, version
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from pathlib import Path
+from threading import Lock
+from typing import Iterator
+
+from typest.typecheckers.mypy import Mypy
+from typest.utils.process import Aborted
+
+
+def _serve(connection: Connection) -> None:
+    # Imported in the worker only, where it stays loaded across files
+    from mypy import api
+
+    while True:
+        args = connection.recv()
+        stdout, _, returncode = api.run(args)
+        connection.send((stdout, returncode))
+
+
+class _Worker:
+    """Process running mypy for one run at a time, kept alive across runs"""
+
+    def __init__(self) -> None:
+        self._connection, child = Pipe()
+        self._process = Process(target=_serve, args=(child,), daemon=True)
+        self._process.start()
+        child.close()
+
+    def run(self, args: list[str], timeout: float | None) -> tuple[str, int]:
+        """Output and exit status of mypy. Raises Aborted, after killing the
+        process, if the run takes longer than `timeout` seconds."""
+        try:
+            self._connection.send(args)
+            if not self._connection.poll(timeout):
+                self.kill()
+                raise Aborted(f"timed out after {timeout:g}s")
+            return self._connection.recv()
+        except (EOFError, OSError):
+            self.kill()
+            raise Aborted("worker process was killed")
+
+    def kill(self) -> None:
+        self._process.kill()
+        self._process.join()
+        self._connection.close()
+
+
+class MypyApi(Mypy):
+    """Runs mypy in-process through `mypy.api`, in worker processes which are
+    kept alive across files. This saves starting an interpreter and importing
+    mypy for every run. Output is the same as mypy's. Of the limits, only the
+    timeout applies."""
+
+    name = "mypy-api"
+
+    # mypy is imported from this interpreter, no other executable can be run
+    executable = None
+
+    # Each run has a worker to itself, so that a run which times out is
+    # aborted without affecting the others. Idle workers are kept for later.
+    _lock = Lock()
+    _idle: list[_Worker] = []
+
+    @classmethod
+    def _json_output(cls) -> bool:
+        try:
+            major, minor = version("mypy").split(".")[:2]
+        except (PackageNotFoundError, ValueError):
+            return False
+        return (int(major), int(minor)) >= (1, 11)
+
+    @classmethod
+    def batch_command(cls, paths: list[Path]) -> list[str]:
+        options = ["--output", "json"] if cls._json_output() else []
+        return [
+            sys.executable,
+            "-m",
+            "mypy",
+            *options,
+            *cls._matrix_options(),
+            *(str(path) for path in paths),
+        ]
+
+    @classmethod
+    def version_command(cls) -> list[str]:
+        return [sys.executable, "-m", "mypy", "--version"]
+
+    @classmethod
+    def installed_version(cls) -> str | None:
+        # The interpreter stays the same when mypy is upgraded, so the version
+        # is taken from the metadata of its package
+        try:
+            return f"mypy {version('mypy')}"
+        except PackageNotFoundError:
+            return None
+
+    @classmethod
+    def _output(cls, paths: list[Path]) -> Iterator[bytes]:
+        with cls._lock:
+            worker = cls._idle.pop() if cls._idle else None
+        if worker is None:
+            worker = _Worker()
+        with cls._command(paths) as command:
+            # A worker which was killed is not returned to the idle ones
+            output, returncode = worker.run(command[3:], cls.timeout)
+        with cls._lock:
+            cls._idle.append(worker)
+        yield from output.encode("utf-8").splitlines(keepends=True)
+        cls._check_returncode(paths, returncode)
@@ -1,51 +1,60 @@
+import json
 import re
+from pathlib import Path
+from typing import Iterable, Iterator
 
 from typest.outcomes import Flaw, RevealedType
 from typest.outcomes.mismatch import Mismatch
-from typest.typecheckers.base import TypeChecker
-from typest.utils.fake_type import parse
+from typest.typecheckers.base import Diagnostic, TypeChecker
 
 
 class Pyright(TypeChecker):
 
     name = "pyright"
-
-    def command(self) -> list[str]:
-        return ["pyright", str(self.path)]
-
-    @staticmethod
-    def _extract_linenumber(line: str) -> int | None:
-        match = re.search(r".*\.py:(\d+):.*", line)
-        if match is None:
-            return None
-        return int(match.group(1))
-
-    @staticmethod
-    def _extract_type(line: str, linenumber: int) -> RevealedType | None:
-        match = re.search(
-            r'.*\.py:\d+:\d+ - information: Type of ".*?" is "(.*)"', line
-        )
-        if match is None:
-            return None
-        return RevealedType(linenumber, parse(match.group(1)))
-
-    @staticmethod
-    def _extract_flaw(line: str, linenumber: int) -> Flaw | None:
-        match = re.search(r".*\.py:\d+:\d+ - error: (.*)", line)
-        if match is None:
-            return None
-        return Flaw(linenumber)
-
-    @staticmethod
-    def _extract_mismatch(line: str, linenumber: int) -> Mismatch | None:
-        pattern = (
-            r".* - error: Expression of type "
-            r'"(.*)" cannot be assigned to declared type "(.*)"'
-        )
-        match = re.search(pattern, line)
-        if not match:
-            return None
-        assigned_type = match.group(2)
-        actual_type = match.group(1)
-
-        return Mismatch(linenumber, assigned_type, actual_type)
+    config_files = ["pyrightconfig.json", "pyproject.toml"]
+    executable = "pyright"
+    matrix_flags = {
+        "python_version": "--pythonversion",
+        "config_file": "--project",
+    }
+
+    message_patterns = {
+        "information": [
+            (re.compile(r'Type of ".*?" is "(?P<typ>.*)"'), RevealedType),
+        ],
+        "error": [
+            (re.compile(r""), Flaw),
+            (
+                re.compile(
+                    r'Expression of type "(?P<actual_type>.*)" cannot be '
+                    r'assigned to declared type "(?P<assigned_type>.*)"'
+                ),
+                Mismatch,
+            ),
+        ],
+    }
+
+    @classmethod
+    def batch_command(cls, paths: list[Path]) -> list[str]:
+        assert cls.executable is not None
+        return [
+            cls.executable,
+            "--outputjson",
+            *cls._matrix_options(),
+            *(str(path) for path in paths),
+        ]
+
+    @classmethod
+    def _diagnostics(cls, lines: Iterable[bytes]) -> Iterator[Diagnostic]:
+        # Pyright reports a single JSON document once it is finished
+        try:
+            report = json.loads(b"".join(lines))
+        except ValueError:
+            return
+        for diagnostic in report.get("generalDiagnostics", []):
+            yield Diagnostic(
+                diagnostic["file"],
+                diagnostic["range"]["start"]["line"] + 1,
+                diagnostic["severity"],
+                diagnostic["message"],
+            )
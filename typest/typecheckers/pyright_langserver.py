@@ -0,0 +1,172 @@
+import atexit
+import json
+from pathlib import Path
+from subprocess import DEVNULL, PIPE, Popen
+from threading import Lock
+from typing import Any, IO, Iterator
+
+from typest.outcomes import Outcome
+from typest.typecheckers.base import Diagnostic
+from typest.typecheckers.pyright import Pyright
+
+
+_SEVERITIES = {1: "error", 2: "warning", 3: "information", 4: "hint"}
+
+
+class _LanguageServer:
+    """Minimal JSON-RPC client for a language server talking over stdio"""
+
+    def __init__(self, command: list[str]) -> None:
+        self._process = Popen(command, stdin=PIPE, stdout=PIPE, stderr=DEVNULL)
+        self._next_id = 0
+
+    def _send(self, message: dict[str, Any]) -> None:
+        assert self._process.stdin is not None
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode("utf-8")
+        self._process.stdin.write(
+            f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+        )
+        self._process.stdin.flush()
+
+    @staticmethod
+    def _receive(stream: IO[bytes]) -> dict[str, Any]:
+        length = 0
+        while True:
+            header = stream.readline()
+            if not header:
+                raise EOFError("Language server terminated unexpectedly")
+            header = header.strip()
+            if not header:
+                break
+            name, _, value = header.decode("ascii").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return json.loads(stream.read(length))
+
+    def notify(self, method: str, params: dict[str, Any]) -> None:
+        self._send({"method": method, "params": params})
+
+    def request(self, method: str, params: dict[str, Any]) -> Any:
+        """Send a request and wait for its response, answering requests of the
+        server in the meantime"""
+        self._next_id += 1
+        request_id = self._next_id
+        self._send({"id": request_id, "method": method, "params": params})
+
+        assert self._process.stdout is not None
+        while True:
+            message = self._receive(self._process.stdout)
+            if "method" in message:
+                if "id" in message:
+                    self._respond(message)
+                continue
+            if message.get("id") != request_id:
+                continue
+            if "error" in message:
+                raise RuntimeError(message["error"].get("message"))
+            return message.get("result")
+
+    def _respond(self, message: dict[str, Any]) -> None:
+        result: Any = None
+        if message["method"] == "workspace/configuration":
+            result = [None for _ in message["params"]["items"]]
+        self._send({"id": message["id"], "result": result})
+
+    def close(self) -> None:
+        try:
+            self.request("shutdown", {})
+            self.notify("exit", {})
+        except (EOFError, BrokenPipeError):
+            pass
+        self._process.wait()
+
+
+class PyrightLangserver(Pyright):
+    """Runs pyright as a language server, which is started once per session.
+    Test files are opened as documents and their diagnostics are pulled from
+    the server. Limits do not apply to the shared server."""
+
+    name = "pyright-langserver"
+
+    # The server is shared by all runs, so it cannot be set up per matrix cell
+    executable = None
+    matrix_flags = {}
+
+    _lock = Lock()
+    _server: _LanguageServer | None = None
+
+    @classmethod
+    def batch_command(cls, paths: list[Path]) -> list[str]:
+        return ["pyright-langserver", "--stdio"]
+
+    @classmethod
+    def version_command(cls) -> list[str]:
+        return ["pyright", "--version"]
+
+    @classmethod
+    def _start(cls) -> _LanguageServer:
+        if cls._server is not None:
+            return cls._server
+
+        server = _LanguageServer(cls.batch_command([]))
+        server.request(
+            "initialize",
+            {
+                "processId": None,
+                "rootUri": Path.cwd().as_uri(),
+                "capabilities": {
+                    "textDocument": {
+                        "diagnostic": {"dynamicRegistration": False},
+                        "publishDiagnostics": {},
+                    },
+                },
+            },
+        )
+        server.notify("initialized", {})
+        cls._server = server
+        atexit.register(cls._stop)
+        return server
+
+    @classmethod
+    def _stop(cls) -> None:
+        if cls._server is not None:
+            cls._server.close()
+            cls._server = None
+
+    @staticmethod
+    def _diagnostic(path: Path, diagnostic: dict[str, Any]) -> Diagnostic:
+        return Diagnostic(
+            str(path),
+            diagnostic["range"]["start"]["line"] + 1,
+            _SEVERITIES.get(diagnostic.get("severity", 1), "error"),
+            diagnostic["message"],
+        )
+
+    @classmethod
+    def _stream_outcomes(
+        cls, paths: list[Path]
+    ) -> Iterator[tuple[Path, dict[int, list[Outcome]]]]:
+        with cls._lock:
+            server = cls._start()
+            for path in paths:
+                document = {"uri": path.resolve().as_uri()}
+                server.notify(
+                    "textDocument/didOpen",
+                    {
+                        "textDocument": {
+                            **document,
+                            "languageId": "python",
+                            "version": 1,
+                            "text": path.read_text(),
+                        }
+                    },
+                )
+                report = server.request(
+                    "textDocument/diagnostic", {"textDocument": document}
+                )
+                server.notify(
+                    "textDocument/didClose", {"textDocument": document}
+                )
+                yield from cls._route(
+                    [path], (cls._diagnostic(path, d) for d in report["items"])
+                )
@@ -1,77 +1,141 @@
-from os import truncate
-import re
-from typing import Optional
-
-
-class FakeBuiltin:
-    types: list[str] = [
-        "bool",
-        "bytes",
-        "bytearray",
-        "complex",
-        "contextmanager",
-        "dict",
-        "float",
-        "frozenset",
-        "function",
-        "GenericAlias",
-        "int",
-        "list",
-        "module",
-        "range",
-        "set",
-        "str",
-        "tuple",
-        "memoryview",
-        "None",
-        "NoneType",
-    ]
+from functools import lru_cache
+from typing import Any, Hashable, Optional
+from weakref import WeakValueDictionary
 
-    def __init__(self, typ: Optional["FakeType"]) -> None:
-        self._type = typ
 
-    def __eq__(self, other: "FakeType") -> bool:
-        if not isinstance(other, FakeBuiltin):
-            return False
+class _Interned:
+    """Base class for immutable, hashable type nodes. Nodes are interned: equal
+    constructor arguments return the identical node, so that comparing equal
+    nodes mostly boils down to an identity check. Nodes are only interned as
+    long as they are in use, so that the tables do not grow without bound."""
+
+    __slots__ = ("_args", "_key", "_hash", "__weakref__")
+
+    _interned: "WeakValueDictionary[tuple, _Interned]"
+
+    def __init_subclass__(cls) -> None:
+        cls._interned = WeakValueDictionary()
+
+    def __new__(cls, *args: Any) -> "_Interned":
+        args = cls._normalize(*args)
+        node = cls._interned.get(args)
+        if node is not None:
+            return node
+
+        node = super().__new__(cls)
+        key = cls._key_of(*args)
+        object.__setattr__(node, "_args", args)
+        object.__setattr__(node, "_key", key)
+        object.__setattr__(node, "_hash", hash((cls, key)))
+        return cls._interned.setdefault(args, node)
+
+    @staticmethod
+    def _normalize(*args: Any) -> tuple:
+        return args
+
+    @staticmethod
+    def _key_of(*args: Any) -> Hashable:
+        """Key deciding about equality of nodes of the same class"""
+        return args
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
-        if self._type in ["None", "NoneType", None]:
-            return other._type in ["None", "NoneType", None]
-        return self._type == other._type
+    def __reduce__(self) -> tuple:
+        return (type(self), self._args)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if type(self) is not type(other) or self._hash != other._hash:
+            return False
+        return self._key == other._key
 
     def __hash__(self) -> int:
-        return hash(self._type)
+        return self._hash
+
+
+class FakeBuiltin(_Interned):
+    __slots__ = ()
+
+    types: frozenset[str] = frozenset(
+        [
+            "bool",
+            "bytes",
+            "bytearray",
+            "complex",
+            "contextmanager",
+            "dict",
+            "float",
+            "frozenset",
+            "function",
+            "GenericAlias",
+            "int",
+            "list",
+            "module",
+            "range",
+            "set",
+            "str",
+            "tuple",
+            "memoryview",
+            "None",
+            "NoneType",
+        ]
+    )
+
+    def __new__(cls, typ: Optional["FakeType"]) -> "FakeBuiltin":
+        return super().__new__(cls, typ)
+
+    @staticmethod
+    def _key_of(typ: Optional["FakeType"]) -> Hashable:
+        if typ in ["None", "NoneType", None]:
+            return "None"
+        return typ
+
+    @property
+    def _type(self) -> Optional["FakeType"]:
+        return self._args[0]
 
     def __repr__(self) -> str:
         return f"builtins.{self._type}"
 
 
-class FakeGeneric:
-    def __init__(self, name: str, *types: "FakeType") -> None:
-        self._name = name
-        self._types = tuple(t for t in types)
+class FakeGeneric(_Interned):
+    __slots__ = ()
 
-    def __eq__(self, other: "FakeType") -> bool:
-        if not isinstance(other, FakeGeneric):
-            return False
-        return self._name == other._name and self._types == other._types
+    def __new__(cls, name: str, *types: "FakeType") -> "FakeGeneric":
+        return super().__new__(cls, name, *types)
+
+    @property
+    def _name(self) -> str:
+        return self._args[0]
+
+    @property
+    def _types(self) -> tuple["FakeType", ...]:
+        return self._args[1:]
 
     def __repr__(self) -> str:
         return f"{self._name}[{self._types}]"
 
 
-class FakeUnion:
-    def __init__(self, *types: "FakeType") -> None:
-        self._types = tuple(
-            parse(t) if isinstance(t, str) else t for t in types
-        )
+class FakeUnion(_Interned):
+    __slots__ = ()
 
-    def __eq__(self, other: "FakeType") -> bool:
-        if not isinstance(other, FakeUnion):
-            return False
-        return set(self._types) == set(other._types)
+    def __new__(cls, *types: "FakeType") -> "FakeUnion":
+        return super().__new__(cls, *types)
 
-    def __hash__(self) -> int:
-        return hash(*self._types)
+    @staticmethod
+    def _normalize(*types: "FakeType") -> tuple:
+        return tuple(parse(t) if isinstance(t, str) else t for t in types)
+
+    @staticmethod
+    def _key_of(*types: "FakeType") -> Hashable:
+        # Neither order nor multiplicity of union members matters
+        return frozenset(types)
+
+    @property
+    def _types(self) -> tuple["FakeType", ...]:
+        return self._args
 
     def __repr__(self) -> str:
         inner = ", ".join([str(x) for x in self._types])
@@ -105,9 +169,9 @@ def parse_arg_list(text: str) -> tuple["FakeType"]:
 def _parse_inner(text: str) -> FakeType:
     text = text.strip()
 
-    for builtin_type in FakeBuiltin.types:
-        if text == builtin_type or text == f"builtins.{builtin_type}":
-            return FakeBuiltin(builtin_type)
+    builtin_type = text.removeprefix("builtins.")
+    if builtin_type in FakeBuiltin.types:
+        return FakeBuiltin(builtin_type)
 
     if "|" in text:
         return FakeUnion(
@@ -117,6 +181,7 @@ def _parse_inner(text: str) -> FakeType:
     return text
 
 
+@lru_cache(maxsize=4096)
 def parse(text: str) -> FakeType:
     """Parse a string representation of a type into a FakeType for ease of
     comparison. This does not check the string to be well-formatted."""
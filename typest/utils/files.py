@@ -0,0 +1,26 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def relative(path: Path) -> Path:
+    """The path relative to the working directory if it is inside of it, so
+    that it reads the same on any machine"""
+    if path.is_absolute() and path.is_relative_to(Path.cwd()):
+        return path.relative_to(Path.cwd())
+    return path
+
+
+def resolved_key(path: Path) -> str:
+    """Key of a file, which is the same for all paths to it"""
+    return path.resolve().as_posix()
+
+
+def write_atomically(path: Path, content: bytes) -> None:
+    """Write the file by replacing it, so that parallel runs never read it
+    partially written"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(handle, "wb") as file:
+        file.write(content)
+    os.replace(temporary, path)
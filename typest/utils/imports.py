@@ -0,0 +1,99 @@
+import ast
+from pathlib import Path
+
+
+def _module_files(root: Path, module: str) -> list[Path]:
+    """Files of a module under the root: its python file and its stub file, if
+    either exists, else those of its package"""
+    base = root.joinpath(*module.split("."))
+    for stem in (base, base / "__init__"):
+        candidates = [stem.with_suffix(".py"), stem.with_suffix(".pyi")]
+        files = [candidate for candidate in candidates if candidate.is_file()]
+        if files:
+            return files
+    return []
+
+
+def _imported_modules(path: Path) -> set[str]:
+    """Absolute names of the modules imported by a python file, relative
+    imports are resolved against the file's package"""
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (SyntaxError, ValueError, OSError):
+        return set()
+
+    package, _ = _package(path)
+    modules: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split(".") if package else []
+                if node.level - 1 > len(parts):
+                    continue
+                parts = parts[: len(parts) - (node.level - 1)]
+                base = ".".join(parts + ([node.module] if node.module else []))
+            else:
+                base = node.module or ""
+            if base:
+                modules.add(base)
+            # `from package import module` imports a submodule
+            modules.update(
+                f"{base}.{alias.name}" if base else alias.name
+                for alias in node.names
+            )
+    return modules
+
+
+def _package(path: Path) -> tuple[str, Path]:
+    """Name of the package a python file belongs to, and the directory this
+    package is importable from"""
+    parts: list[str] = []
+    directory = path.resolve().parent
+    while any(
+        (directory / name).is_file() for name in ("__init__.py", "__init__.pyi")
+    ):
+        parts.insert(0, directory.name)
+        directory = directory.parent
+    return ".".join(parts), directory
+
+
+def module_name(path: Path) -> str:
+    """Absolute name of the module of a python file"""
+    package, _ = _package(path)
+    if path.stem == "__init__":
+        return package
+    return f"{package}.{path.stem}" if package else path.stem
+
+
+def direct_imports(path: Path, roots: list[Path]) -> set[Path]:
+    """Files of the local modules imported by the python file itself,
+    including their stub files. Modules are looked up under the roots, and
+    under the root of the file's package."""
+    _, package_root = _package(path)
+    found: set[Path] = set()
+    for module in _imported_modules(path):
+        for root in [*roots, package_root]:
+            files = _module_files(root, module)
+            if files:
+                found.update(file.resolve() for file in files)
+                break
+    return found
+
+
+def local_imports(path: Path, roots: list[Path] | None = None) -> set[Path]:
+    """Files of all local modules imported by the python file, directly or
+    transitively. Modules are looked up under the roots, defaulting to the
+    current working directory and the directory of the file."""
+    if roots is None:
+        roots = [Path.cwd(), path.resolve().parent]
+
+    found: set[Path] = set()
+    pending = [path.resolve()]
+    while pending:
+        for file in direct_imports(pending.pop(), roots):
+            if file not in found and file != path.resolve():
+                found.add(file)
+                pending.append(file)
+    return found
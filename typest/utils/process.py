@@ -0,0 +1,119 @@
+import os
+import signal
+import sys
+import tempfile
+from contextlib import contextmanager
+from subprocess import PIPE, Popen
+from threading import Event, Timer
+from typing import Iterator
+
+from typest.utils.posix import resource
+
+
+class Aborted(Exception):
+    """A typechecker's process was killed before it completed, by a timeout or
+    because it exceeded a limit"""
+
+
+_REASONS = {
+    "SIGXCPU": "exceeded the CPU time limit",
+    "SIGSEGV": "crashed, possibly exceeding the memory limit",
+    "SIGABRT": "crashed, possibly exceeding the memory limit",
+}
+
+# Messages of python and node processes which ran out of memory
+_OUT_OF_MEMORY = (b"MemoryError", b"heap out of memory")
+
+
+def _kill(process: Popen[bytes]) -> None:
+    # The process group includes any processes the typechecker started itself
+    if process.returncode is not None:
+        return
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+def _limited(
+    command: list[str], memory_limit: int | None, cpu_limit: int | None
+) -> list[str]:
+    """The command, run through a wrapper which sets the limits before it
+    executes the command, so that they apply from its start. Unlike a
+    `preexec_fn`, this is safe in the presence of threads."""
+    if resource is None or (memory_limit is None and cpu_limit is None):
+        return command
+
+    limits = []
+    if memory_limit is not None:
+        limits.append(f"(resource.RLIMIT_AS, ({memory_limit}, {memory_limit}))")
+    if cpu_limit is not None:
+        # Exceeding the soft limit sends SIGXCPU, the hard limit SIGKILL
+        limits.append(f"(resource.RLIMIT_CPU, ({cpu_limit}, {cpu_limit + 1}))")
+    code = (
+        "import os, resource, sys\n"
+        f"for limit, values in [{', '.join(limits)}]:\n"
+        "    resource.setrlimit(limit, values)\n"
+        "os.execvp(sys.argv[1], sys.argv[1:])\n"
+    )
+    return [sys.executable, "-I", "-S", "-c", code, *command]
+
+
+@contextmanager
+def supervised(
+    command: list[str],
+    timeout: float | None = None,
+    memory_limit: int | None = None,
+    cpu_limit: int | None = None,
+) -> Iterator[Popen[bytes]]:
+    """Run the command in a process group of its own, with its stdout piped.
+    The process is killed after `timeout` seconds, and its address space in
+    bytes and CPU time in seconds are limited (on Linux). Leaving the context
+    early kills the process group.
+
+    Raises Aborted if the process was killed, or ran out of memory."""
+    stderr = tempfile.TemporaryFile()
+    process = Popen(
+        _limited(command, memory_limit, cpu_limit),
+        stdout=PIPE,
+        stderr=stderr,
+        start_new_session=True,
+    )
+    expired = Event()
+    timer = None
+    if timeout is not None:
+        timer = Timer(timeout, lambda: (expired.set(), _kill(process)))
+        timer.daemon = True
+        timer.start()
+
+    try:
+        yield process
+    except BaseException:
+        _kill(process)
+        raise
+    finally:
+        if timer is not None:
+            timer.cancel()
+        process.wait()
+        assert process.stdout is not None
+        process.stdout.close()
+        stderr.seek(0)
+        errors = stderr.read()
+        stderr.close()
+        # Messages of the typechecker on stderr are passed through
+        if errors:
+            sys.stderr.buffer.write(errors)
+            sys.stderr.flush()
+
+    if expired.is_set():
+        raise Aborted(f"timed out after {timeout:g}s")
+    if process.returncode < 0:
+        name = signal.Signals(-process.returncode).name
+        raise Aborted(_REASONS.get(name, f"killed by {name}"))
+    if process.returncode != 0 and any(
+        message in errors for message in _OUT_OF_MEMORY
+    ):
+        raise Aborted("exceeded the memory limit")
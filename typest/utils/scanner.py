@@ -0,0 +1,61 @@
+import re
+import tokenize
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Protocol
+
+from typest.outcomes import Flaw, Outcome, RevealedType
+
+
+class UnsupportedFile(Exception):
+    pass
+
+
+class _Expectation(Protocol):
+    @classmethod
+    def from_comment(cls, linenumber: int, comment: str) -> Optional[Outcome]:
+        ...
+
+
+_DIRECTIVE = re.compile(r"expect-[a-z]+")
+
+_EXPECTATIONS: dict[str, type[_Expectation]] = {
+    "expect-type": RevealedType,
+    "expect-error": Flaw,
+}
+
+
+@lru_cache(maxsize=1024)
+def _scan(path: Path, mtime: int, size: int) -> tuple[Outcome, ...]:
+    expected: list[Outcome] = []
+    try:
+        with tokenize.open(path) as file:
+            for token in tokenize.generate_tokens(file.readline):
+                if token.type != tokenize.COMMENT:
+                    continue
+                text = token.string[1:]
+                directive = _DIRECTIVE.search(text)
+                if directive is None:
+                    continue
+                expectation_type = _EXPECTATIONS.get(directive.group())
+                if expectation_type is None:
+                    continue
+                expectation = expectation_type.from_comment(
+                    token.start[0], text
+                )
+                if expectation is not None:
+                    expected.append(expectation)
+    except (SyntaxError, tokenize.TokenError, UnicodeDecodeError) as error:
+        raise UnsupportedFile(str(error)) from error
+    return tuple(expected)
+
+
+def scan(path: Path) -> list[Outcome]:
+    """Extract the expected outcomes from the comments of a python file, in a
+    single pass over its tokens. Results are cached as long as the file is
+    unchanged, so that they are shared by all typecheckers.
+
+    Raises UnsupportedFile if the file cannot be tokenized."""
+    resolved = path.resolve()
+    stat = resolved.stat()
+    return list(_scan(resolved, stat.st_mtime_ns, stat.st_size))
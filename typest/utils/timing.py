@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from typest.utils.posix import resource
+
+
+def _peak_rss() -> int | None:
+    """Peak resident set size of this process in bytes"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Span:
+    """Measurement of one stage of running a typechecker on a file, or on a
+    batch of files"""
+
+    __slots__ = (
+        "stage",
+        "typechecker",
+        "label",
+        "thread",
+        "start",
+        "wall",
+        "cpu",
+        "rss",
+    )
+
+    def __init__(
+        self, stage: str, typechecker: str, label: str, start: float
+    ) -> None:
+        self.stage = stage
+        self.typechecker = typechecker
+        self.label = label
+        self.thread = threading.get_ident()
+        self.start = start
+        self.wall = 0.0
+        self.cpu: float | None = None
+        self.rss: int | None = None
+
+    def __repr__(self) -> str:
+        return f"Span({self.stage}, {self.typechecker}, {self.label})"
+
+
+class Timings:
+    """Recorder of wall time, CPU time and peak RSS of the stages of a run.
+    By default CPU time is the one of the measuring thread and RSS the peak of
+    this process; measurements of subprocesses fill in their own."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def measure(
+        self, stage: str, typechecker: str, label: str
+    ) -> Iterator[Span]:
+        start = time.perf_counter()
+        cpu = time.thread_time()
+        span = Span(stage, typechecker, label, start - self._origin)
+        try:
+            yield span
+        finally:
+            span.wall = time.perf_counter() - start
+            if span.cpu is None:
+                span.cpu = time.thread_time() - cpu
+            if span.rss is None:
+                span.rss = _peak_rss()
+            self.spans.append(span)
+
+    def durations(self, count: int) -> str:
+        """Summary of the slowest files and typecheckers. All are listed if
+        count is 0."""
+        totals: dict[tuple[str, str], dict[str, Span]] = {}
+        for span in self.spans:
+            stages = totals.setdefault((span.label, span.typechecker), {})
+            stages[span.stage] = span
+
+        def total(stages: dict[str, Span]) -> float:
+            # The subprocess runs while its output is parsed, so it is not
+            # counted separately
+            return sum(
+                s.wall for s in stages.values() if s.stage != "subprocess"
+            )
+
+        ranked = sorted(totals.items(), key=lambda i: total(i[1]), reverse=True)
+        if count:
+            ranked = ranked[:count]
+
+        lines = [f"slowest {len(ranked)} durations"]
+        for (label, typechecker), stages in ranked:
+            details = ", ".join(self._format(span) for span in stages.values())
+            lines.append(
+                f"{total(stages):8.2f}s  {typechecker:<20}{label}  ({details})"
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format(span: Span) -> str:
+        text = f"{span.stage} {span.wall:.2f}s"
+        if span.cpu is not None:
+            text += f" cpu {span.cpu:.2f}s"
+        if span.stage == "subprocess" and span.rss is not None:
+            text += f" rss {span.rss / 2**20:.1f}MiB"
+        return text
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Spans in the Trace Event Format, for chrome://tracing or Perfetto"""
+        return {
+            "traceEvents": [
+                {
+                    "name": span.stage,
+                    "cat": span.typechecker,
+                    "ph": "X",
+                    "ts": span.start * 10**6,
+                    "dur": span.wall * 10**6,
+                    "pid": os.getpid(),
+                    "tid": span.thread,
+                    "args": {
+                        "file": span.label,
+                        "cpu": span.cpu,
+                        "rss": span.rss,
+                    },
+                }
+                for span in self.spans
+            ]
+        }
@@ -0,0 +1,80 @@
+import time
+from pathlib import Path
+from typing import Iterator
+
+from typest.utils.imports import local_imports
+
+
+class Watcher:
+    """Polls the test files under a path, and the local modules they import,
+    for changes"""
+
+    def __init__(self, target: Path, interval: float = 0.5) -> None:
+        self.target = target
+        self.interval = interval
+        self._imports = {
+            testfile: local_imports(testfile) for testfile in self._testfiles()
+        }
+        self._mtimes = self._snapshot(self._watched())
+
+    def _testfiles(self) -> list[Path]:
+        if self.target.is_file():
+            return [self.target.resolve()]
+        return sorted(
+            testfile.resolve() for testfile in self.target.rglob("*.py")
+        )
+
+    def _watched(self) -> set[Path]:
+        return set(self._imports).union(*self._imports.values())
+
+    @staticmethod
+    def _snapshot(paths: set[Path]) -> dict[Path, int]:
+        mtimes: dict[Path, int] = {}
+        for path in paths:
+            try:
+                mtimes[path] = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+        return mtimes
+
+    def poll(self) -> list[Path]:
+        """Test files affected by changes since the last poll: test files which
+        changed themselves, and test files importing a changed module"""
+        for testfile in self._testfiles():
+            if testfile not in self._imports:
+                self._imports[testfile] = set()
+        mtimes = self._snapshot(self._watched())
+        changed = {
+            path
+            for path in mtimes.keys() | self._mtimes.keys()
+            if mtimes.get(path) != self._mtimes.get(path)
+        }
+
+        affected = [
+            testfile
+            for testfile, imports in self._imports.items()
+            if testfile in changed or imports & changed
+        ]
+        for testfile in affected:
+            if testfile.exists():
+                self._imports[testfile] = local_imports(testfile)
+            else:
+                del self._imports[testfile]
+
+        # Modules which are imported newly are watched from now on. The others
+        # keep their times from before the imports were read again, so that
+        # changes in the meantime are found by the next poll.
+        watched = self._watched()
+        self._mtimes = {
+            path: mtime for path, mtime in mtimes.items() if path in watched
+        }
+        self._mtimes.update(self._snapshot(watched - mtimes.keys()))
+        return [testfile for testfile in affected if testfile.exists()]
+
+    def changes(self) -> Iterator[list[Path]]:
+        """Block until test files are affected by a change, yield them, repeat"""
+        while True:
+            time.sleep(self.interval)
+            affected = self.poll()
+            if affected:
+                yield affected